@@ -0,0 +1,269 @@
+"""
+Benchmarks of the table construction and rendering.
+
+Run them from the root of the repository::
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --rows 1000 --compare results.json
+
+Every case measures the wall time, the peak of the memory allocated and the
+number of queries of each phase, and the results are written as JSON so they
+can be compared across releases.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from datetime import timezone
+from importlib import metadata
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db import models  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+
+from django_table_sort.renderers import StringRenderer  # noqa: E402
+from django_table_sort.renderers import TemplateRenderer  # noqa: E402
+from django_table_sort.table import TableSort  # noqa: E402
+from tests.models import Person  # noqa: E402
+
+ROWS = [1_000, 10_000, 100_000]
+CELL_TEMPLATES = {"age": '<span class="number">{{ value }}</span>'}
+RENDERERS = {
+    "string": StringRenderer(),
+    "template": TemplateRenderer(),
+    "string_cell_templates": StringRenderer(cell_templates=CELL_TEMPLATES),
+    "template_cell_templates": TemplateRenderer(cell_templates=CELL_TEMPLATES),
+}
+WIDE_COLUMNS = [5, 20, 50]
+MAX_COLUMNS = max(WIDE_COLUMNS)
+
+
+class WideRow(models.Model):
+    """Synthetic model with many columns, created only for the benchmarks."""
+
+    class Meta:
+        app_label = "tests"
+        db_table = "benchmarks_widerow"
+
+
+for number in range(MAX_COLUMNS):
+    if number % 2:
+        field = models.CharField(max_length=50, verbose_name=f"Text {number}")
+    else:
+        field = models.IntegerField(verbose_name=f"Number {number}")
+    field.contribute_to_class(WideRow, f"column_{number}")
+
+
+def setup_database() -> None:
+    call_command("migrate", verbosity=0)
+    with connection.schema_editor() as schema_editor:
+        schema_editor.create_model(WideRow)
+
+
+def fill_table(model: type[models.Model], rows: int) -> None:
+    """Create objects until the table has the given number of rows."""
+    count = model.objects.count()
+    if count >= rows:
+        return
+    if model is Person:
+        objects = [
+            Person(name=f"Person {number}", age=number % 100)
+            for number in range(count, rows)
+        ]
+    else:
+        objects = [
+            WideRow(
+                **{
+                    f"column_{column}": f"Text {number}" if column % 2 else number
+                    for column in range(MAX_COLUMNS)
+                }
+            )
+            for number in range(count, rows)
+        ]
+    model.objects.bulk_create(objects, batch_size=5_000)
+
+
+def measure(function) -> dict:
+    """
+    Call the function measuring the time, memory and queries.
+
+    The memory is measured in a second call, since tracing the allocations
+    slows down the function.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": elapsed,
+        "peak_bytes": peak,
+        "queries": len(queries),
+    }
+
+
+def run_case(name: str, create_table, repeat: int) -> dict:
+    """
+    Measure the phases of a table, keeping the fastest of ``repeat`` runs.
+
+    ``create_table`` should return a new ``TableSort`` every time it's called.
+    """
+    phases = {
+        # The columns are created on first access, so access them to measure
+        # the construction of the table.
+        "construction": lambda: create_table().column_names,
+        "headers": lambda: create_table().get_table_headers(),
+        "body": lambda: create_table().get_table_body(),
+        "render": lambda: create_table().render(),
+    }
+    result = {"name": name, "phases": {}}
+    for phase, function in phases.items():
+        best = None
+        for _ in range(repeat):
+            measurement = measure(function)
+            if best is None or measurement["seconds"] < best["seconds"]:
+                best = measurement
+        result["phases"][phase] = best
+    return result
+
+
+def get_long_query_request(request_factory: RequestFactory, columns: int):
+    """Return a request with many filter lookups and a sort on every column."""
+    lookups = [f"filter_{number}=value+{number}" for number in range(50)]
+    lookups += [f"o=-column_{number}" for number in range(0, columns, 2)]
+    return request_factory.get("?" + "&".join(lookups))
+
+
+def get_cases(rows_list: list[int]):
+    """Generate the name and table factory of every benchmark case."""
+    request_factory = RequestFactory()
+    request = request_factory.get("?o=name")
+    for rows in rows_list:
+        fill_table(Person, rows)
+        fill_table(WideRow, rows)
+        people = Person.objects.order_by("pk")[:rows]
+        yield f"person/queryset/{rows}", lambda people=people: TableSort(
+            request, people.all()
+        )
+        people_list = list(people.all())
+        yield f"person/list/{rows}", lambda people_list=people_list: TableSort(
+            request,
+            people_list,
+            fields=None,
+            column_names={"name": "Name", "age": "Age"},
+        )
+        yield f"person/added_columns/{rows}", lambda people=people: TableSort(
+            request,
+            people.all(),
+            added_columns=[
+                (("next_age", "Next Age"), lambda person: person.age + 1),
+                (("upper_name", "Upper Name"), lambda person: person.name.upper()),
+            ],
+        )
+        for renderer_name, renderer in RENDERERS.items():
+            yield (
+                f"person/renderer_{renderer_name}/{rows}",
+                lambda people=people, renderer=renderer: TableSort(
+                    request, people.all(), renderer=renderer
+                ),
+            )
+        wide_rows = WideRow.objects.order_by("pk")[:rows]
+        for columns in WIDE_COLUMNS:
+            fields = [f"column_{number}" for number in range(columns)]
+            yield (
+                f"wide/{columns}_columns/{rows}",
+                lambda wide_rows=wide_rows, fields=fields: TableSort(
+                    request, wide_rows.all(), fields=fields
+                ),
+            )
+        fields = [f"column_{number}" for number in range(MAX_COLUMNS)]
+        long_query_request = get_long_query_request(request_factory, MAX_COLUMNS)
+        yield (
+            f"wide/long_query_string/{rows}",
+            lambda wide_rows=wide_rows, fields=fields, request=long_query_request: (
+                TableSort(request, wide_rows.all(), fields=fields)
+            ),
+        )
+
+
+def get_package_version() -> None | str:
+    try:
+        return metadata.version("django-table-sort")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def compare(results: list[dict], previous_path: str) -> None:
+    """Print the time ratio of every phase against previous results."""
+    with open(previous_path) as file:
+        previous = {case["name"]: case for case in json.load(file)["results"]}
+    for case in results:
+        if case["name"] not in previous:
+            continue
+        for phase, measurement in case["phases"].items():
+            before = previous[case["name"]]["phases"].get(phase)
+            if not before or not before["seconds"]:
+                continue
+            ratio = measurement["seconds"] / before["seconds"]
+            print(f"{case['name']:<40} {phase:<14} {ratio:6.2f}x")
+
+
+def main(argv: None | list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=ROWS, help="Number of rows to test."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs of every phase, the best is kept."
+    )
+    parser.add_argument("--output", help="File to write the results as JSON.")
+    parser.add_argument("--compare", help="Previous results to compare with.")
+    args = parser.parse_args(argv)
+
+    setup_database()
+    results = []
+    for name, create_table in get_cases(sorted(args.rows)):
+        result = run_case(name, create_table, args.repeat)
+        results.append(result)
+        phases = ", ".join(
+            f"{phase} {measurement['seconds'] * 1000:.1f}ms"
+            for phase, measurement in result["phases"].items()
+        )
+        print(f"{name:<40} {phases}")
+
+    output = {
+        "metadata": {
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "django_table_sort": get_package_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(output, file, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Callable
+from typing import Iterable
+
+from django.db.models import Avg
+from django.db.models import Count
+from django.db.models import Max
+from django.db.models import Min
+from django.db.models import Sum
+
+AGGREGATES = {
+    "sum": Sum,
+    "avg": Avg,
+    "min": Min,
+    "max": Max,
+    "count": Count,
+}
+
+
+def get_aggregate_name(aggregate) -> str:
+    """
+    Return the name of an aggregate.
+
+    The aggregate can be given by its name or as one of the aggregate classes
+    in ``django.db.models``.
+    """
+    name = aggregate if isinstance(aggregate, str) else getattr(aggregate, "name", "")
+    name = str(name).lower()
+    if name not in AGGREGATES:
+        raise ValueError(
+            f"Unknown aggregate {aggregate!r}, "
+            f"the available aggregates are {', '.join(AGGREGATES)}."
+        )
+    return name
+
+
+def aggregate_objects(
+    objects: Iterable, aggregates: dict[str, tuple[str, Callable]]
+) -> dict:
+    """
+    Compute the aggregates over a list of objects in a single pass.
+
+    :param objects: objects to aggregate.
+    :param aggregates: ``dict`` mapping the column fields to the aggregate name
+        and the accessor of the column.
+    """
+    sums = dict.fromkeys(aggregates, 0)
+    counts = dict.fromkeys(aggregates, 0)
+    minimums = dict.fromkeys(aggregates)
+    maximums = dict.fromkeys(aggregates)
+    for obj in objects:
+        for field, (_, accessor) in aggregates.items():
+            value = accessor(obj)
+            if value is None:
+                continue
+            counts[field] += 1
+            if minimums[field] is None or value < minimums[field]:
+                minimums[field] = value
+            if maximums[field] is None or value > maximums[field]:
+                maximums[field] = value
+            if aggregates[field][0] in ("sum", "avg"):
+                sums[field] += value
+    results = {}
+    for field, (name, _) in aggregates.items():
+        if name == "count":
+            results[field] = counts[field]
+        elif name == "min":
+            results[field] = minimums[field]
+        elif name == "max":
+            results[field] = maximums[field]
+        elif counts[field] == 0:
+            results[field] = None
+        elif name == "sum":
+            results[field] = sums[field]
+        else:
+            results[field] = sums[field] / counts[field]
+    return results
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Model
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+
+VERSION_KEY_PREFIX = "django_table_sort:version"
+TABLE_KEY_PREFIX = "django_table_sort:table"
+
+
+class CacheStats:
+    """Counters of the values found and not found in a cache."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the ratio of renders served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+cache_stats = CacheStats()
+
+# Cache aliases used by the tables of every model, to know which versions
+# should be changed when the objects of a model change.
+_watched_models: dict[type[Model], set[str]] = {}
+_watched_models_lock = threading.Lock()
+
+
+def get_version_key(model: type[Model]) -> str:
+    return f"{VERSION_KEY_PREFIX}:{model._meta.label_lower}"
+
+
+def watch_models(models: Iterable[type[Model]], alias: str) -> None:
+    """Invalidate the tables cached in ``alias`` when the models change."""
+    with _watched_models_lock:
+        for model in models:
+            _watched_models.setdefault(model, set()).add(alias)
+
+
+def get_model_versions(models: Iterable[type[Model]], alias: str) -> list:
+    """Return the current version of every model, creating the missing ones."""
+    cache = caches[alias]
+    keys = [get_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def get_invalidated_aliases(model: type[Model]) -> set[str]:
+    """
+    Return the caches where the tables of the model should be invalidated.
+
+    They are the caches of the tables rendered or declared in this process and
+    the caches in the ``TABLE_SORT_CACHE_ALIASES`` setting, that are always
+    invalidated, even in the processes that never rendered a cached table.
+    """
+    aliases = set(_watched_models.get(model, ()))
+    aliases.update(getattr(settings, "TABLE_SORT_CACHE_ALIASES", ()))
+    return aliases
+
+
+def invalidate_model(model: type[Model], alias: None | str = None) -> None:
+    """
+    Invalidate the cached tables displaying objects of the model.
+
+    If no ``alias`` is given, the tables are invalidated in every cache returned
+    by :func:`get_invalidated_aliases`.
+    """
+    aliases = [alias] if alias is not None else get_invalidated_aliases(model)
+    for cache_alias in aliases:
+        caches[cache_alias].set(get_version_key(model), time.time_ns(), timeout=None)
+
+
+def _model_saved_or_deleted(sender, **kwargs) -> None:
+    invalidate_model(sender)
+
+
+def _m2m_changed(sender, instance, action, model, **kwargs) -> None:
+    if not action.startswith("post_"):
+        return
+    for changed_model in (type(instance), model, sender):
+        invalidate_model(changed_model)
+
+
+post_save.connect(_model_saved_or_deleted, dispatch_uid="django_table_sort_save")
+post_delete.connect(_model_saved_or_deleted, dispatch_uid="django_table_sort_delete")
+m2m_changed.connect(_m2m_changed, dispatch_uid="django_table_sort_m2m")
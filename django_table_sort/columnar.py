@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Sequence
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ColumnarRow:
+    """A row of a :class:`ColumnarData`, giving access to its values as attributes."""
+
+    __slots__ = ("_data", "_position")
+
+    def __init__(self, data: ColumnarData, position: int) -> None:
+        self._data = data
+        self._position = position
+
+    def __getattr__(self, name: str):
+        try:
+            column = self._data.columns[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        return column[self._position]
+
+
+class ColumnarData:
+    """
+    Data stored by columns instead of by rows, to sort and render it in bulk.
+
+    The columns can be lists, tuples or NumPy arrays, all with the same length.
+    If NumPy is installed, sorting uses ``numpy.lexsort``.
+
+    :param columns: ``dict`` mapping the name of every column to its values.
+    :param index: ``list`` with the positions of the rows in display order,
+        the default is the order of the columns.
+    """
+
+    def __init__(
+        self, columns: Mapping[str, Sequence], index: None | Sequence[int] = None
+    ) -> None:
+        self.columns = dict(columns)
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All the columns should have the same length.")
+        self.length = lengths.pop() if lengths else 0
+        self.index = index
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence], names: Sequence[str]) -> ColumnarData:
+        """Create the data from a list of tuples with the values of every row."""
+        columns = list(zip(*rows))
+        if not columns:
+            return cls({name: [] for name in names})
+        return cls(dict(zip(names, columns)))
+
+    @classmethod
+    def from_dataframe(cls, dataframe) -> ColumnarData:
+        """Create the data from a pandas ``DataFrame``."""
+        return cls(
+            {str(name): dataframe[name].to_numpy() for name in dataframe.columns}
+        )
+
+    @classmethod
+    def from_structured_array(cls, array) -> ColumnarData:
+        """Create the data from a NumPy structured array."""
+        return cls({name: array[name] for name in array.dtype.names})
+
+    @classmethod
+    def wrap(cls, data):
+        """
+        Return the data as ``ColumnarData`` if it's stored by columns.
+
+        A ``dict`` of columns, a pandas ``DataFrame`` and a NumPy structured array
+        are wrapped, anything else is returned as given.
+        """
+        if isinstance(data, Mapping):
+            return cls(data)
+        if hasattr(data, "columns") and hasattr(data, "to_numpy"):
+            return cls.from_dataframe(data)
+        if getattr(getattr(data, "dtype", None), "names", None):
+            return cls.from_structured_array(data)
+        return data
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator[ColumnarRow]:
+        positions = self.index if self.index is not None else range(self.length)
+        for position in positions:
+            yield ColumnarRow(self, position)
+
+    def slice(self, start: int = 0, stop: None | int = None) -> ColumnarData:
+        """Return the rows between ``start`` and ``stop`` in display order."""
+        index = self.index if self.index is not None else range(self.length)
+        return ColumnarData(self.columns, list(index[start:stop]))
+
+    def get_column(self, name: str) -> list:
+        """Return the values of the column in display order."""
+        values = self.columns[name]
+        if numpy is not None and isinstance(values, numpy.ndarray):
+            if self.index is not None:
+                values = values[self.index]
+            return values.tolist()
+        if self.index is None:
+            return list(values)
+        return [values[position] for position in self.index]
+
+    def sort(self, ordering: list[str]) -> ColumnarData:
+        """
+        Return the data sorted by the given sort lookups.
+
+        The lookups are column names, prefixed with ``-`` to sort descending.
+        The ``None`` values are placed last in both directions, as in the lists.
+        """
+        if not ordering or self.length == 0:
+            return self
+        if numpy is not None:
+            index = self._numpy_sort_index(ordering)
+        else:
+            index = self._python_sort_index(ordering)
+        return ColumnarData(self.columns, index)
+
+    def _numpy_sort_index(self, ordering: list[str]):
+        keys = []
+        for lookup in ordering:
+            descending = lookup.startswith("-")
+            values = numpy.asarray(self.columns[lookup.lstrip("-")])
+            if self.index is not None:
+                values = values[self.index]
+            nulls = (
+                numpy.array([value is None for value in values], dtype=bool)
+                if values.dtype.kind == "O"
+                else None
+            )
+            if nulls is not None and nulls.any():
+                keys.append(_get_ranks_nulls_last(values, nulls, descending))
+            elif not descending:
+                keys.append(values)
+            elif values.dtype.kind in "if":
+                keys.append(-values)
+            else:
+                # Sort by the negated rank of the values, that works with any type.
+                _, ranks = numpy.unique(values, return_inverse=True)
+                keys.append(-ranks.reshape(-1))
+        if len(keys) == 1:
+            index = numpy.argsort(keys[0], kind="stable")
+        else:
+            # lexsort uses the last key as the primary one.
+            index = numpy.lexsort(keys[::-1])
+        if self.index is not None:
+            index = numpy.asarray(self.index)[index]
+        return index
+
+    def _python_sort_index(self, ordering: list[str]) -> list[int]:
+        index = list(self.index if self.index is not None else range(self.length))
+        for lookup in reversed(ordering):
+            values = self.columns[lookup.lstrip("-")]
+            nulls = [position for position in index if values[position] is None]
+            if nulls:
+                index = [position for position in index if values[position] is not None]
+            index.sort(key=values.__getitem__, reverse=lookup.startswith("-"))
+            index.extend(nulls)
+        return index
+
+
+def _get_ranks_nulls_last(values, nulls, descending: bool):
+    """Return the rank of every value to sort them, placing the nulls last."""
+    _, ranks = numpy.unique(values[~nulls], return_inverse=True)
+    ranks = ranks.reshape(-1)
+    keys = numpy.full(len(values), len(values))
+    keys[~nulls] = -ranks if descending else ranks
+    return keys
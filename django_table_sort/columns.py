@@ -1,8 +1,16 @@
+from operator import attrgetter
 from typing import Callable
 from typing import Dict
+from typing import List
+from typing import Mapping
 from typing import Optional
 
+from django.db.models import Manager
 from django.db.models import Model
+from django.db.models.constants import LOOKUP_SEP
+
+from django_table_sort.formatters import format_value
+from django_table_sort.memo import MemoizedFunction
 
 EMPTY_COLUMN = "EMPTY-COLUMN"
 
@@ -13,40 +21,177 @@ class BaseColumn:
         column_field: str,
         column_header: str,
         css_classes: Optional[Dict] = None,
+        formatter: Optional[Callable] = None,
     ) -> None:
         self.column_field = column_field
         self.column_header = column_header
         css_classes = css_classes or {}
         self.css_classes = css_classes.get(column_field, "")
+        self.formatter = formatter
 
     def get_value(self, instance: Model):
         """Return the column value for a given instance."""
         return getattr(instance, self.column_field)
 
+    def get_accessor(self) -> Callable:
+        """Return a callable that receives an instance and returns the value."""
+        return self.get_value
+
+    def get_formatter(self) -> Callable:
+        """Return a callable that receives a value and returns the cell text."""
+        return self.formatter if self.formatter is not None else format_value
+
     def classes(self) -> str:
         return self.css_classes
 
 
+def get_lookup_values(instance: Model, attributes: List[str]) -> list:
+    """
+    Return the values of the attributes of the object, following the relations.
+
+    The many-valued relations return the values of every related object, and
+    the ``None`` values are skipped.
+    """
+    value = instance
+    for position, attribute in enumerate(attributes):
+        value = getattr(value, attribute)
+        if value is None:
+            return []
+        if isinstance(value, Manager):
+            return [
+                related_value
+                for related in value.all()
+                for related_value in get_lookup_values(
+                    related, attributes[position + 1 :]
+                )
+            ]
+    return [value]
+
+
 class TableColumn(BaseColumn):
-    pass
+    """
+    Column displaying a field of the objects.
+
+    The column field can be a lookup like ``author__name`` to display a field of
+    a related object. Many-valued relations are displayed as a comma separated
+    list of the related objects, or of the values of the rest of the lookup for
+    every related object, like ``books__title``.
+    """
+
+    def __init__(
+        self,
+        column_field: str,
+        column_header: str,
+        css_classes: Optional[Dict] = None,
+        attributes: Optional[List[str]] = None,
+        many_valued: bool = False,
+        formatter: Optional[Callable] = None,
+    ) -> None:
+        super().__init__(column_field, column_header, css_classes, formatter)
+        self.attributes = attributes or column_field.split(LOOKUP_SEP)
+        self.many_valued = many_valued
+
+    def get_value(self, instance: Model):
+        """Return the column value for a given instance."""
+        value = instance
+        for position, attribute in enumerate(self.attributes):
+            value = getattr(value, attribute)
+            if value is None:
+                return None
+            if isinstance(value, Manager):
+                attributes = self.attributes[position + 1 :]
+                return ", ".join(
+                    [
+                        str(related_value)
+                        for related in value.all()
+                        for related_value in get_lookup_values(related, attributes)
+                    ]
+                )
+        return value
+
+    def get_accessor(self) -> Callable:
+        """Return a callable that receives an instance and returns the value."""
+        if (
+            type(self).get_value is TableColumn.get_value
+            and len(self.attributes) == 1
+            and not self.many_valued
+        ):
+            return attrgetter(self.attributes[0])
+        return self.get_value
 
 
 class TableExtraColumn(BaseColumn):
+    """
+    Column displaying the result of a function called with every object.
+
+    If ``threaded`` is set, the function is called in a pool of threads for all
+    the objects of a batch at once, for functions waiting on I/O like a cache
+    server or an HTTP service.
+    """
+
     def __init__(
         self,
         column_field: str,
         column_header: str,
         function: Callable,
         css_classes: Optional[Dict] = None,
+        formatter: Optional[Callable] = None,
+        threaded: bool = False,
     ) -> None:
-        super().__init__(column_field, column_header, css_classes)
+        super().__init__(column_field, column_header, css_classes, formatter)
         self.function = function
+        self.threaded = threaded
 
     def get_value(self, instance: Model):
         """Return the column value for a given instance."""
         return self.function(instance)
 
+    def get_accessor(self) -> Callable:
+        """Return a callable that receives an instance and returns the value."""
+        if type(self).get_value is TableExtraColumn.get_value:
+            if isinstance(self.function, MemoizedFunction):
+                return self.function.get_accessor()
+            return self.function
+        return self.get_value
+
+
+class TableBatchColumn(TableExtraColumn):
+    """
+    Extra column whose function receives a batch of objects.
+
+    The function should return a ``list`` with the value of every object, in the
+    same order, or a ``dict`` mapping the primary key of the objects to their
+    values.
+    """
+
+    def get_values(self, instances: list) -> list:
+        """Return the column values for the given instances."""
+        values = self.function(instances)
+        if isinstance(values, Mapping):
+            return [values.get(instance.pk, "") for instance in instances]
+        values = list(values)
+        if len(values) != len(instances):
+            raise ValueError(
+                f"The function of the column {self.column_field!r} returned "
+                f"{len(values)} values for {len(instances)} objects."
+            )
+        return values
+
+    def get_value(self, instance: Model):
+        """Return the column value for a given instance."""
+        return self.get_values([instance])[0]
+
+
+def _empty_value(instance: Model) -> str:
+    return ""
+
 
 class EmptyColumn(BaseColumn):
     def get_value(self, instance: Model):
         return ""
+
+    def get_accessor(self) -> Callable:
+        """Return a callable that receives an instance and returns the value."""
+        if type(self).get_value is EmptyColumn.get_value:
+            return _empty_value
+        return self.get_value
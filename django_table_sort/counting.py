@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Callable
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import QuerySet
+
+COUNT_KEY_PREFIX = "django_table_sort:count"
+
+
+class TableCount:
+    """
+    Total number of objects of a table.
+
+    :param value: ``int`` number of objects.
+    :param exact: ``bool`` if the value is the exact number of objects or an
+        estimate.
+    :param capped: ``bool`` if there are more objects than the value.
+    """
+
+    def __init__(self, value: int, exact: bool = True, capped: bool = False) -> None:
+        self.value = value
+        self.exact = exact
+        self.capped = capped
+
+    def __int__(self) -> int:
+        return self.value
+
+    def __str__(self) -> str:
+        if self.capped:
+            return f"{self.value:,}+"
+        if not self.exact:
+            return f"~{self.value:,}"
+        return f"{self.value:,}"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, TableCount):
+            return NotImplemented
+        return (self.value, self.exact, self.capped) == (
+            other.value,
+            other.exact,
+            other.capped,
+        )
+
+    def __repr__(self) -> str:
+        return f"TableCount({self.value!r}, exact={self.exact}, capped={self.capped})"
+
+
+class CountStrategy:
+    """Base class of the strategies to count the objects of a table."""
+
+    def count(self, queryset: QuerySet) -> TableCount:
+        raise NotImplementedError
+
+
+class ExactCount(CountStrategy):
+    """Count all the objects with ``COUNT(*)``."""
+
+    def count(self, queryset: QuerySet) -> TableCount:
+        return TableCount(queryset.count())
+
+
+class CappedCount(CountStrategy):
+    """
+    Count the objects up to a limit, showing ``10,000+`` above it.
+
+    The count is done over a subquery with a ``LIMIT``, so the database stops
+    reading rows once the limit is reached.
+
+    :param limit: ``int`` maximum number of objects counted.
+    """
+
+    def __init__(self, limit: int = 10_000) -> None:
+        self.limit = limit
+
+    def count(self, queryset: QuerySet) -> TableCount:
+        value = queryset[: self.limit + 1].count()
+        if value > self.limit:
+            return TableCount(self.limit, exact=False, capped=True)
+        return TableCount(value)
+
+
+class CachedCount(CountStrategy):
+    """
+    Keep the count of another strategy in the cache.
+
+    The key is derived from the sql of the query, so every filter of the
+    objects is counted once per timeout.
+
+    :param timeout: ``int`` seconds to keep the count in the cache, default to
+        the timeout of the cache.
+    :param cache_alias: ``str`` name of the cache, default=``"default"``.
+    :param strategy: :class:`CountStrategy` used to count the objects on a cache
+        miss, default to :class:`ExactCount`.
+    """
+
+    def __init__(
+        self,
+        timeout: int = DEFAULT_TIMEOUT,
+        cache_alias: str = "default",
+        strategy: None | CountStrategy = None,
+    ) -> None:
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        self.strategy = strategy if strategy is not None else ExactCount()
+
+    def get_cache_key(self, queryset: QuerySet) -> None | str:
+        """Return the key of the count in the cache, ``None`` for empty queries."""
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return None
+        key_parts = (queryset.db, sql, params, type(self.strategy).__name__)
+        digest = hashlib.sha256(repr(key_parts).encode()).hexdigest()
+        return f"{COUNT_KEY_PREFIX}:{digest}"
+
+    def count(self, queryset: QuerySet) -> TableCount:
+        key = self.get_cache_key(queryset)
+        if key is None:
+            return TableCount(0)
+        cache = caches[self.cache_alias]
+        cached = cache.get(key)
+        if cached is not None:
+            return TableCount(*cached)
+        result = self.strategy.count(queryset)
+        cache.set(key, (result.value, result.exact, result.capped), self.timeout)
+        return result
+
+
+def get_database_estimate(queryset: QuerySet) -> None | int:
+    """
+    Return the number of rows of the table estimated by the database.
+
+    Only unfiltered querysets on PostgreSQL are estimated, using the statistics
+    of the table, ``None`` is returned for anything else.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql" or queryset.query.has_filters():
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCount(CountStrategy):
+    """
+    Use an estimate of the number of objects given by the database.
+
+    :param estimate: function receiving the queryset and returning the estimated
+        number of objects, or ``None`` if it can't be estimated. The default
+        uses the statistics of the table on PostgreSQL.
+    :param fallback: :class:`CountStrategy` used when there isn't an estimate,
+        default to :class:`CappedCount`.
+    """
+
+    def __init__(
+        self,
+        estimate: Callable[[QuerySet], None | int] = get_database_estimate,
+        fallback: None | CountStrategy = None,
+    ) -> None:
+        self.estimate = estimate
+        self.fallback = fallback if fallback is not None else CappedCount()
+
+    def count(self, queryset: QuerySet) -> TableCount:
+        value = self.estimate(queryset)
+        if value is None:
+            return self.fallback.count(queryset)
+        return TableCount(value, exact=False)
+
+
+COUNT_STRATEGIES = {
+    "exact": ExactCount,
+    "capped": CappedCount,
+    "cached": CachedCount,
+    "estimated": EstimatedCount,
+}
+
+
+def get_count_strategy(strategy: str | CountStrategy) -> CountStrategy:
+    """Return the count strategy given by its name or as an instance."""
+    if isinstance(strategy, CountStrategy):
+        return strategy
+    if strategy not in COUNT_STRATEGIES:
+        raise ValueError(
+            f"Unknown count strategy {strategy!r}, "
+            f"the available strategies are {', '.join(COUNT_STRATEGIES)}."
+        )
+    return COUNT_STRATEGIES[strategy]()
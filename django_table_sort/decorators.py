@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from functools import wraps
+from typing import Callable
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def table_condition(get_table: Callable) -> Callable:
+    """
+    Decorator to answer conditional requests of a view displaying a table.
+
+    ``get_table`` receives the arguments of the view and returns the table. The
+    ETag and the Last-Modified of the table are computed without fetching the
+    objects, and if the client already has the current version of the page the
+    view isn't called and a ``304 Not Modified`` response is returned. Otherwise
+    the view is called with the table after the request.
+
+    The table should have the ``last_modified_field`` or the ``version``
+    parameter, otherwise it has no ETag and the view is always called.
+
+    .. code-block:: python
+
+        def get_table(request):
+            return TableSort(
+                request, Person.objects.all(), last_modified_field="updated_at"
+            )
+
+
+        @table_condition(get_table)
+        def view(request, table):
+            return render(request, "template.html", context={"table": table})
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def inner(request, *args, **kwargs):
+            table = get_table(request, *args, **kwargs)
+            etag = table.get_etag()
+            if etag is None:
+                return view(request, table, *args, **kwargs)
+            last_modified = table.get_last_modified()
+            timestamp = int(last_modified.timestamp()) if last_modified else None
+            response = get_conditional_response(
+                request, etag=etag, last_modified=timestamp
+            )
+            if response is None:
+                response = view(request, table, *args, **kwargs)
+            if request.method in ("GET", "HEAD"):
+                if timestamp is not None and not response.has_header("Last-Modified"):
+                    response["Last-Modified"] = http_date(timestamp)
+                if not response.has_header("ETag"):
+                    response["ETag"] = etag
+            return response
+
+        return inner
+
+    return decorator
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import csv
+import datetime
+import tempfile
+from decimal import Decimal
+from typing import Iterable
+from typing import Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+XLSX_READ_SIZE = 64 * 1024
+
+
+class Echo:
+    """File-like object returning the written value, used to stream a csv."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class ExportJSONEncoder(DjangoJSONEncoder):
+    """JSON encoder that falls back to the text of any other object."""
+
+    def default(self, o):
+        try:
+            return super().default(o)
+        except TypeError:
+            return str(o)
+
+
+def get_export_value(value):
+    """Return the text of a value, keeping the numbers and booleans."""
+    if value is None:
+        return ""
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def export_csv(
+    headers: list[str], rows: Iterable[list], chunk_size: int = 2000
+) -> Iterator[str]:
+    """Generate a csv file in chunks of ``chunk_size`` rows."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(headers)
+    lines: list[str] = []
+    for row in rows:
+        lines.append(writer.writerow([get_export_value(value) for value in row]))
+        if len(lines) >= chunk_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def export_jsonl(
+    fields: list[str], rows: Iterable[list], chunk_size: int = 2000
+) -> Iterator[str]:
+    """Generate a JSON Lines file in chunks of ``chunk_size`` rows."""
+    encoder = ExportJSONEncoder()
+    lines: list[str] = []
+    for row in rows:
+        lines.append(encoder.encode(dict(zip(fields, row))) + "\n")
+        if len(lines) >= chunk_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
+
+
+def get_xlsx_value(value):
+    """Return a value that can be written in a xlsx cell."""
+    if value is None:
+        return ""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime.datetime) and value.tzinfo is not None:
+        return str(value)
+    if isinstance(value, (str, int, float, bool, datetime.date, datetime.time)):
+        return value
+    return str(value)
+
+
+def export_xlsx(headers: list[str], rows: Iterable[list]) -> Iterator[bytes]:
+    """
+    Generate a xlsx file.
+
+    The file is written in constant memory mode to a temporary file, that is
+    read in chunks once complete. Requires ``xlsxwriter``.
+    """
+    try:
+        import xlsxwriter
+    except ImportError as error:
+        raise ImportError(
+            "The xlsxwriter package is required to export the table to xlsx."
+        ) from error
+
+    with tempfile.NamedTemporaryFile(suffix=".xlsx") as file:
+        workbook = xlsxwriter.Workbook(
+            file.name,
+            {"constant_memory": True, "default_date_format": "yyyy-mm-dd hh:mm:ss"},
+        )
+        worksheet = workbook.add_worksheet()
+        worksheet.write_row(0, 0, headers)
+        for row_number, row in enumerate(rows, start=1):
+            worksheet.write_row(row_number, 0, [get_xlsx_value(value) for value in row])
+        workbook.close()
+        file.seek(0)
+        while chunk := file.read(XLSX_READ_SIZE):
+            yield chunk
+
+
+EXPORT_FORMATS = ("csv", "jsonl", "xlsx")
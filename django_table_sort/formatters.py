@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import re
+from html import escape
+from typing import Callable
+from typing import Sequence
+
+from django.db.models import BooleanField
+from django.db.models import DateField
+from django.db.models import DateTimeField
+from django.db.models import DecimalField
+from django.db.models import Field
+from django.db.models import ForeignObjectRel
+from django.db.models import TimeField
+from django.utils.formats import localize
+from django.utils.formats import number_format
+from django.utils.safestring import SafeData
+from django.utils.timezone import template_localtime
+from django.utils.translation import gettext
+
+_UNSAFE_CHARACTERS = re.compile(r"[&<>\"']")
+
+
+def format_value(value) -> str:
+    """Return the text of a cell, empty for ``None``."""
+    if value is None:
+        return ""
+    return str(value)
+
+
+def format_boolean(value) -> str:
+    if value is None:
+        return ""
+    return gettext("Yes") if value else gettext("No")
+
+
+def format_date(value) -> str:
+    """Format a date or a time using the localization settings."""
+    if value is None:
+        return ""
+    return localize(value)
+
+
+def format_datetime(value) -> str:
+    """Format a datetime in the current time zone, as the templates do."""
+    if value is None:
+        return ""
+    return localize(template_localtime(value))
+
+
+def get_decimal_formatter(decimal_places: None | int) -> Callable:
+    def format_decimal(value) -> str:
+        if value is None:
+            return ""
+        return number_format(value, decimal_places)
+
+    return format_decimal
+
+
+def get_choices_formatter(choices: dict, formatter: Callable) -> Callable:
+    def format_choice(value) -> str:
+        return formatter(choices.get(value, value))
+
+    return format_choice
+
+
+def get_field_formatter(field: Field | ForeignObjectRel, nullable: bool) -> Callable:
+    """
+    Return the function formatting the values of a model field.
+
+    The choices are displayed with their label, like ``get_FOO_display``, and
+    the booleans, dates and decimals are formatted as the templates do. Plain
+    values that can't be ``None`` use ``str``.
+
+    :param field: model field displayed in the column.
+    :param nullable: if the value can be ``None``, for nullable fields or
+        fields of a related object.
+    """
+    if isinstance(field, ForeignObjectRel) or field.is_relation:
+        formatter = format_value
+    elif isinstance(field, BooleanField):
+        formatter = format_boolean
+    elif isinstance(field, DateTimeField):
+        formatter = format_datetime
+    elif isinstance(field, (DateField, TimeField)):
+        formatter = format_date
+    elif isinstance(field, DecimalField):
+        formatter = get_decimal_formatter(field.decimal_places)
+    elif nullable:
+        formatter = format_value
+    else:
+        formatter = str
+    if getattr(field, "flatchoices", None):
+        return get_choices_formatter(dict(field.flatchoices), formatter)
+    return formatter
+
+
+def escape_cells(cells: Sequence[str]) -> Sequence[str]:
+    """
+    Escape the HTML of the cells of a column.
+
+    The cells are checked in bulk, so they are returned as given in the common
+    case where none has a special character. The safe strings, created with
+    ``mark_safe`` or ``format_html``, are never escaped.
+    """
+    if not _UNSAFE_CHARACTERS.search("".join(cells)):
+        return cells
+    return [cell if isinstance(cell, SafeData) else escape(cell) for cell in cells]
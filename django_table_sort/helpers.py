@@ -1,3 +1,15 @@
+from __future__ import annotations
+
+import functools
+from typing import Iterable
+from typing import Iterator
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Field
+from django.db.models import ForeignObjectRel
+from django.db.models import Model
+from django.db.models.constants import LOOKUP_SEP
+
 from django_table_sort.columns import EMPTY_COLUMN
 from django_table_sort.columns import EmptyColumn
 
@@ -17,3 +29,62 @@ class EmptyColumnGenerator:
     def get_next_empty_column(self, column_header: str):
         """Return the next empty column."""
         return EmptyColumn(self.get_next_empty_column_key(), column_header)
+
+
+def resolve_lookup(model: type[Model], lookup: str) -> list[Field | ForeignObjectRel]:
+    """
+    Return the fields traversed by a lookup like ``author__name``.
+
+    Raise ``FieldDoesNotExist`` if the lookup can't be resolved.
+    """
+    fields = []
+    for field_name in lookup.split(LOOKUP_SEP):
+        if model is None:
+            raise FieldDoesNotExist(f"Cannot resolve the lookup {lookup}.")
+        field = model._meta.get_field(field_name)
+        fields.append(field)
+        model = field.related_model
+    return fields
+
+
+def get_field_attribute(field: Field | ForeignObjectRel) -> str:
+    """Return the name of the attribute used to access the field in an instance."""
+    if isinstance(field, ForeignObjectRel):
+        return field.get_accessor_name()
+    return field.name
+
+
+def get_field_header(field: Field | ForeignObjectRel) -> str:
+    """Return the default header for the field."""
+    if isinstance(field, ForeignObjectRel):
+        return str(field.related_model._meta.verbose_name_plural).title()
+    return str(field.verbose_name).title()
+
+
+def iter_batches(iterable: Iterable, size: int) -> Iterator[list]:
+    """Iterate over the items in lists of ``size`` items."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def get_function_name(function) -> str:
+    """
+    Return the dotted name of a function, to use it in the keys of the cache.
+
+    Partial functions use the name of the wrapped function and their arguments,
+    and the callable objects use the name of their class.
+    """
+    if isinstance(function, functools.partial):
+        return (
+            f"{get_function_name(function.func)}"
+            f"({function.args!r}, {function.keywords!r})"
+        )
+    module = getattr(function, "__module__", type(function).__module__)
+    name = getattr(function, "__qualname__", type(function).__qualname__)
+    return f"{module}.{name}"
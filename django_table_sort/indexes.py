@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model
+from django.db.models import UniqueConstraint
+
+
+def get_indexed_fields(model: type[Model]) -> list[tuple[str, ...]]:
+    """
+    Return the names of the fields of every index of the model.
+
+    The indexes are the primary key, the fields with ``db_index`` or ``unique``,
+    including the foreign keys, the ``Meta.indexes``, the
+    ``Meta.unique_together`` and the unique constraints with fields. The indexes
+    on expressions and the partial indexes are ignored.
+    """
+    opts = model._meta
+    indexes = [(opts.pk.name,)]
+    for field in opts.concrete_fields:
+        if field.db_index or field.unique:
+            indexes.append((field.name,))
+    for index in opts.indexes:
+        if index.fields and index.condition is None:
+            indexes.append(tuple(field.lstrip("-") for field in index.fields))
+    indexes.extend(tuple(fields) for fields in opts.unique_together)
+    indexes.extend(tuple(fields) for fields in getattr(opts, "index_together", ()))
+    for constraint in opts.constraints:
+        if (
+            isinstance(constraint, UniqueConstraint)
+            and constraint.fields
+            and constraint.condition is None
+        ):
+            indexes.append(tuple(constraint.fields))
+    return indexes
+
+
+def get_field_name(model: type[Model], lookup: str) -> None | str:
+    """Return the name of the field of the model sorted by the lookup."""
+    field_name = lookup.lstrip("-")
+    if field_name == "pk":
+        return model._meta.pk.name
+    try:
+        field = model._meta.get_field(field_name)
+    except FieldDoesNotExist:
+        return None
+    if not field.concrete:
+        return None
+    if field.is_relation and field.related_model._meta.ordering:
+        # The objects are sorted by the ordering of the related model.
+        return None
+    return field.name
+
+
+def is_indexed_ordering(model: type[Model], ordering: list[str]) -> bool:
+    """
+    Check if the objects can be sorted by the lookups using an index.
+
+    The fields of the lookups should be the first fields of an index of the
+    model. Lookups traversing relations never use an index.
+    """
+    fields = tuple(get_field_name(model, lookup) for lookup in ordering)
+    if None in fields:
+        return False
+    return any(index[: len(fields)] == fields for index in get_indexed_fields(model))
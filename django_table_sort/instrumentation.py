@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from django.db.models import Model
+
+PHASES = ("columns", "fetch", "body", "headers", "template")
+
+
+class RenderMetrics:
+    """
+    Measurements of a table render.
+
+    :ivar phases: ``dict`` with the seconds spent in every phase of the render:
+        ``columns`` creating the columns, ``fetch`` fetching the objects,
+        ``body`` generating the rows, including the added columns, ``headers``
+        generating the headers with the sort urls and ``template`` rendering
+        the template.
+    :ivar queries: ``int`` number of queries executed while rendering.
+    :ivar column_times: ``dict`` with the seconds spent in the function of
+        every added column.
+    """
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+        self.column_times: dict[str, float] = {}
+
+    @property
+    def total(self) -> float:
+        """Return the seconds spent in all the phases."""
+        return sum(self.phases.values())
+
+    def count_query(self, execute, sql, params, many, context):
+        """Database execute wrapper counting the queries."""
+        self.queries += 1
+        return execute(sql, params, many, context)
+
+    def time_column(self, column_field: str, accessor: Callable) -> Callable:
+        """Wrap the accessor of a column to add the time spent to the column."""
+        self.column_times.setdefault(column_field, 0.0)
+
+        def timed_accessor(instance: Model):
+            start = time.perf_counter()
+            try:
+                return accessor(instance)
+            finally:
+                self.column_times[column_field] += time.perf_counter() - start
+
+        return timed_accessor
+
+    def as_dict(self) -> dict:
+        return {
+            "phases": dict(self.phases),
+            "total": self.total,
+            "queries": self.queries,
+            "column_times": dict(self.column_times),
+        }
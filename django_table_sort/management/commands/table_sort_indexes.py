@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.utils.module_loading import autodiscover_modules
+
+from django_table_sort.columns import TableColumn
+from django_table_sort.helpers import resolve_lookup
+from django_table_sort.indexes import is_indexed_ordering
+from django_table_sort.table import Table
+
+
+def get_table_classes(cls: type[Table] = Table) -> list[type[Table]]:
+    """Return the subclasses of ``Table`` declaring a model, recursively."""
+    tables = []
+    for subclass in cls.__subclasses__():
+        if getattr(subclass.Meta, "model", None) is not None:
+            tables.append(subclass)
+        tables.extend(get_table_classes(subclass))
+    return tables
+
+
+def get_unindexed_sorts(table_class: type[Table]) -> list[str]:
+    """Return the sorts of the table that can't use an index of the model."""
+    model = table_class.Meta.model
+    table = table_class(None, model._default_manager.none())
+    sorts = []
+    for column in table.column_names:
+        if not isinstance(column, TableColumn) or column.many_valued:
+            continue
+        try:
+            resolve_lookup(model, column.column_field)
+        except FieldDoesNotExist:
+            continue
+        if not is_indexed_ordering(model, [column.column_field]):
+            sorts.append(column.column_field)
+    ordering = list(model._meta.ordering)
+    if ordering and not is_indexed_ordering(model, ordering):
+        sorts.append(f"default ordering {', '.join(ordering)}")
+    return sorts
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the columns of the declared tables whose sort can't use an index "
+        "of the database, to add the indexes deliberately."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fail",
+            action="store_true",
+            help="Exit with an error if any table has unindexed sorts.",
+        )
+
+    def handle(self, *args, **options):
+        autodiscover_modules("tables")
+        unindexed_tables = 0
+        for table_class in get_table_classes():
+            name = f"{table_class.__module__}.{table_class.__qualname__}"
+            model_label = table_class.Meta.model._meta.label
+            sorts = get_unindexed_sorts(table_class)
+            threshold = getattr(table_class.Meta, "sort_index_threshold", None)
+            if not sorts:
+                if options["verbosity"] > 1:
+                    self.stdout.write(f"{name} ({model_label}): all sorts indexed")
+                continue
+            if threshold is not None:
+                if options["verbosity"] > 1:
+                    self.stdout.write(
+                        f"{name} ({model_label}): sorting restricted above "
+                        f"{threshold} rows"
+                    )
+                continue
+            unindexed_tables += 1
+            self.stdout.write(f"{name} ({model_label}):")
+            for sort in sorts:
+                self.stdout.write(f"  {sort}: unindexed sort")
+        if unindexed_tables and options["fail"]:
+            raise CommandError(f"{unindexed_tables} tables have unindexed sorts.")
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+from typing import Hashable
+
+from django_table_sort.cache import CacheStats
+
+MEMO_SCOPES = ("render", "process")
+
+_missing = object()
+
+
+class LRUCache:
+    """
+    Thread safe cache keeping the most recently used values.
+
+    :param maxsize: ``int`` maximum number of values kept.
+    :param timeout: ``float`` seconds to keep every value, default=``None`` that
+        keeps them until they are the least recently used.
+    """
+
+    def __init__(self, maxsize: int = 1024, timeout: None | float = None) -> None:
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self._values: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            try:
+                value, expires = self._values[key]
+            except KeyError:
+                return default
+            if expires is not None and expires < time.monotonic():
+                del self._values[key]
+                return default
+            self._values.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value) -> None:
+        expires = time.monotonic() + self.timeout if self.timeout is not None else None
+        with self._lock:
+            self._values[key] = (value, expires)
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MemoizedFunction:
+    """
+    Function of an added column whose values are memoized by a key of the object.
+
+    The function is only called once for every key, and the other objects with
+    the same key reuse the value. Use :func:`memoize` to create it.
+
+    :ivar stats: :class:`~django_table_sort.cache.CacheStats` with the values
+        found in the memo and the values computed.
+    :ivar cache: :class:`LRUCache` with the values, for the ``"process"`` scope.
+    """
+
+    def __init__(
+        self,
+        function: Callable,
+        key: Callable,
+        scope: str = "render",
+        maxsize: int = 1024,
+        timeout: None | float = None,
+    ) -> None:
+        if scope not in MEMO_SCOPES:
+            raise ValueError(
+                f"Unknown memo scope {scope!r}, "
+                f"the available scopes are {', '.join(MEMO_SCOPES)}."
+            )
+        if inspect.iscoroutinefunction(function):
+            raise ValueError("Async functions can't be memoized.")
+        functools.update_wrapper(self, function)
+        self.function = function
+        self.key = key
+        self.scope = scope
+        self.stats = CacheStats()
+        self.cache = LRUCache(maxsize, timeout) if scope == "process" else None
+
+    def __call__(self, instance):
+        return self.get_accessor()(instance)
+
+    def get_accessor(self) -> Callable:
+        """
+        Return the accessor of the column for a render.
+
+        With the ``"render"`` scope every accessor has its own memo, so the
+        values are only reused within a render.
+        """
+        function, key_function, stats = self.function, self.key, self.stats
+        if self.cache is not None:
+            get_value, set_value = self.cache.get, self.cache.set
+        else:
+            values: dict = {}
+            get_value, set_value = values.get, values.__setitem__
+
+        def memoized(instance):
+            key = key_function(instance)
+            value = get_value(key, _missing)
+            if value is not _missing:
+                stats.hit()
+                return value
+            stats.miss()
+            value = function(instance)
+            set_value(key, value)
+            return value
+
+        return memoized
+
+
+def memoize(
+    function: Callable,
+    key: Callable,
+    scope: str = "render",
+    maxsize: int = 1024,
+    timeout: None | float = None,
+) -> MemoizedFunction:
+    """
+    Memoize the values of the function of an added column by a key of the object.
+
+    :param function: function of the added column, receiving an object.
+    :param key: function receiving an object and returning the key of its value,
+        like ``operator.attrgetter("category_id")``.
+    :param scope: ``"render"`` to reuse the values within a render, or
+        ``"process"`` to reuse them across the renders of the process.
+    :param maxsize: ``int`` maximum number of values kept with the ``"process"``
+        scope.
+    :param timeout: ``float`` seconds to keep the values with the ``"process"``
+        scope, default=``None`` that keeps them until they are the least
+        recently used.
+    """
+    return MemoizedFunction(function, key, scope, maxsize, timeout)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import base64
+import datetime
+import json
+from typing import Container
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.db.models import Field
+from django.db.models import Model
+from django.db.models import Q
+
+from django_table_sort.helpers import resolve_lookup
+
+
+class KeysetPage:
+    """
+    A page of objects fetched using keyset pagination.
+
+    :param object_list: ``list`` of objects in the page.
+    :param next_cursor: ``str`` cursor to fetch the next page, ``None`` if this
+        is the last page.
+    :param previous_cursor: ``str`` cursor to fetch the previous page, ``None``
+        if this is the first page.
+    """
+
+    def __init__(
+        self,
+        object_list: list,
+        next_cursor: None | str = None,
+        previous_cursor: None | str = None,
+    ) -> None:
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    JSON encoder of the cursor values, keeping the microseconds of the times.
+
+    ``DjangoJSONEncoder`` rounds them to milliseconds, so the seek filter of a
+    sort by a ``DateTimeField`` could match the last row of the page again.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values: list, reverse: bool = False) -> str:
+    """Encode the sort values of a row and the direction in a cursor."""
+    if reverse:
+        payload = {"v": values, "r": True}
+    else:
+        payload = {"v": values}
+    data = json.dumps(payload, cls=CursorEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> None | tuple[list, bool]:
+    """Decode a cursor, return ``None`` if the cursor isn't valid."""
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(data)
+    except ValueError:
+        return None
+    if not isinstance(payload, dict) or not isinstance(payload.get("v"), list):
+        return None
+    return payload["v"], bool(payload.get("r", False))
+
+
+def get_cursor_value(value):
+    """Return the value to store in a cursor for the given sort value."""
+    if isinstance(value, Model):
+        return value.pk
+    return value
+
+
+def get_lookup_field(model: type[Model], lookup: str) -> tuple[Field, bool]:
+    """Return the field sorted by a keyset lookup and if its value can be null."""
+    field_name = lookup.lstrip("-")
+    if field_name == "pk":
+        return model._meta.pk, False
+    fields = resolve_lookup(model, field_name)
+    return fields[-1], any(getattr(field, "null", True) for field in fields)
+
+
+def clean_cursor_values(
+    model: type[Model], ordering: list[str], values: list
+) -> None | list:
+    """
+    Convert the values of a cursor to the type of the sorted fields.
+
+    Return ``None`` if the cursor doesn't match the ordering or a value isn't
+    valid, like a cursor from other sort lookups or a tampered one.
+    """
+    if len(values) != len(ordering):
+        return None
+    cleaned_values = []
+    for lookup, value in zip(ordering, values):
+        field, nullable = get_lookup_field(model, lookup)
+        if value is None:
+            if not nullable:
+                return None
+            cleaned_values.append(None)
+            continue
+        if field.is_relation:
+            field = field.target_field
+        try:
+            cleaned_values.append(field.to_python(value))
+        except (ValidationError, TypeError):
+            return None
+    return cleaned_values
+
+
+def get_keyset_ordering_expressions(
+    model: type[Model], ordering: list[str], reverse: bool = False
+) -> list:
+    """
+    Return the expressions to sort the objects for keyset pagination.
+
+    The null values are sorted last, or first when fetching the previous page
+    in reverse, on every database.
+    """
+    expressions = []
+    for lookup in ordering:
+        field_name = lookup.lstrip("-")
+        descending = lookup.startswith("-") != reverse
+        if not get_lookup_field(model, lookup)[1]:
+            expressions.append(f"-{field_name}" if descending else field_name)
+            continue
+        nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+        if descending:
+            expressions.append(F(field_name).desc(**nulls))
+        else:
+            expressions.append(F(field_name).asc(**nulls))
+    return expressions
+
+
+def get_keyset_filter(
+    ordering: list[str],
+    values: list,
+    reverse: bool = False,
+    nullable: Container[str] = (),
+) -> Q:
+    """
+    Return the filter to seek the rows after the given sort values.
+
+    This is the expanded form of ``(a, b, pk) > (x, y, z)`` taking into account
+    the direction of every sort lookup. The null values of the ``nullable``
+    fields are sorted last, so they are after any other value, or before when
+    seeking in reverse.
+    """
+    seek_filter = Q()
+    equal_filter = Q()
+    for lookup, value in zip(ordering, values):
+        field = lookup[1:] if lookup.startswith("-") else lookup
+        descending = lookup.startswith("-") != reverse
+        if value is None:
+            equal = Q(**{f"{field}__isnull": True})
+            after = Q(**{f"{field}__isnull": False}) if reverse else None
+        else:
+            operator = "lt" if descending else "gt"
+            equal = Q(**{field: value})
+            after = Q(**{f"{field}__{operator}": value})
+            if field in nullable and not reverse:
+                after |= Q(**{f"{field}__isnull": True})
+        if after is not None:
+            seek_filter |= equal_filter & after
+        equal_filter &= equal
+    return seek_filter
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from django.template import engines
+from django.template.loader import get_template
+from django.utils.html import conditional_escape
+from django.utils.safestring import SafeString
+
+HEADER_TEMPLATE = """
+                <th class="column-sorted{table_header_clases}">
+                    <div>
+                        {column_name}
+                        <div class="sort-options {show_sort}">
+                            <a href="?{sort_url}" role="button" title="{ordering_text}">
+                                <i class="fa-solid fa-sort{sort_direction}"></i>
+                            </a>
+                        </div>
+                        <div class="sort-options">
+                            <a href="?{remove_sort_url}"
+                                class="{hide_cancel}"
+                                role="button"
+                                title="Remove sort">
+                                    <i class="fa-solid fa-ban"></i>
+                            </a>
+                        </div>
+                    </div>
+                </th>"""
+
+
+class TableRenderer:
+    """
+    Base class of the renderers generating the headers and rows of a table.
+
+    The renderer receives the text of the cells already formatted and escaped,
+    and should escape the ``column_header`` unless it's a safe string.
+
+    :param cell_templates: ``dict`` having the fields as keys and the source of
+        a template rendering a cell of the column as values. The templates are
+        compiled once, the first time they are used, and receive the text of
+        the cell as ``value``.
+    :param using: ``str`` name of the template engine used to compile the
+        templates, default to the first engine configured.
+    """
+
+    def __init__(
+        self, cell_templates: None | dict[str, str] = None, using: None | str = None
+    ) -> None:
+        self.cell_templates = cell_templates or {}
+        self.using = using
+        self._compiled_cell_templates: dict = {}
+
+    def get_engine(self):
+        if self.using is not None:
+            return engines[self.using]
+        return engines.all()[0]
+
+    def get_cell_template(self, field: str):
+        """Return the compiled template of the cells of the column, if any."""
+        if field not in self.cell_templates:
+            return None
+        if field not in self._compiled_cell_templates:
+            self._compiled_cell_templates[field] = self.get_engine().from_string(
+                self.cell_templates[field]
+            )
+        return self._compiled_cell_templates[field]
+
+    def render_cells(self, fields: list[str], columns_cells: list[list[str]]):
+        """Render the cells of the columns with a cell template."""
+        if not self.cell_templates:
+            return columns_cells
+        rendered_columns = []
+        for field, cells in zip(fields, columns_cells):
+            template = self.get_cell_template(field)
+            if template is not None:
+                cells = [template.render({"value": SafeString(cell)}) for cell in cells]
+            rendered_columns.append(cells)
+        return rendered_columns
+
+    def render_header(self, context: dict) -> str:
+        """
+        Generate the header of a column.
+
+        :param context: ``dict`` with the ``column``, its ``column_header``,
+            ``field`` and ``css_classes``, if the column is ``sortable`` and for
+            the sortable columns the ``sort_url``, the ``remove_sort_url``, if
+            it's the ``first_sort`` and if it's sorted ``descending``.
+        """
+        raise NotImplementedError
+
+    def render_rows(self, fields: list[str], columns_cells: list[list[str]]) -> str:
+        """Generate the rows of the table from the text of the cells of every column."""
+        raise NotImplementedError
+
+    def render_footer(self, fields: list[str], cells: list[str]) -> str:
+        """Generate the cells of the footer from their text."""
+        raise NotImplementedError
+
+
+class StringRenderer(TableRenderer):
+    """Renderer building the HTML with string operations, the fastest one."""
+
+    def render_header(self, context: dict) -> str:
+        column_name = conditional_escape(context["column_header"])
+        if not context["sortable"]:
+            return f"<th>{column_name}</th>"
+        first_sort = context["first_sort"]
+        return HEADER_TEMPLATE.format(
+            remove_sort_url=context["remove_sort_url"],
+            sort_direction=""
+            if first_sort
+            else "-up"
+            if not context["descending"]
+            else "-down",
+            column_name=column_name,
+            ordering_text=f"Sort by {column_name}" if first_sort else "Toggle sort",
+            hide_cancel="hidden" if first_sort else "",
+            show_sort="show" if not first_sort else "",
+            sort_url=context["sort_url"],
+            table_header_clases=context["css_classes"],
+        )
+
+    def render_rows(self, fields: list[str], columns_cells: list[list[str]]) -> str:
+        columns_cells = self.render_cells(fields, columns_cells)
+        return "".join(
+            [
+                "<tr><td>" + "</td><td>".join(cells) + "</td></tr>"
+                for cells in zip(*columns_cells)
+            ]
+        )
+
+    def render_footer(self, fields: list[str], cells: list[str]) -> str:
+        return "".join([f"<td>{cell}</td>" for cell in cells])
+
+
+class TemplateRenderer(TableRenderer):
+    """
+    Renderer using templates for the headers and the rows.
+
+    The templates are loaded once, when the renderer is first used, so they can
+    be customized without overriding Python code. They can use any template
+    engine configured, like Jinja2.
+
+    :param header_template: ``str`` name of the template of a header, receiving
+        the context described in :meth:`TableRenderer.render_header`.
+    :param row_template: ``str`` name of the template of a row, receiving the
+        text of the ``cells`` and the ``fields`` of the columns.
+    :param footer_template: ``str`` name of the template of the cells of the
+        footer, receiving the same context as the row_template.
+    """
+
+    def __init__(
+        self,
+        header_template: str = "django_table_sort/header.html",
+        row_template: str = "django_table_sort/row.html",
+        footer_template: str = "django_table_sort/footer.html",
+        cell_templates: None | dict[str, str] = None,
+        using: None | str = None,
+    ) -> None:
+        super().__init__(cell_templates, using)
+        self.header_template = header_template
+        self.row_template = row_template
+        self.footer_template = footer_template
+        self._compiled_templates: dict = {}
+
+    def get_template(self, template_name: str):
+        if template_name not in self._compiled_templates:
+            self._compiled_templates[template_name] = get_template(
+                template_name, using=self.using
+            )
+        return self._compiled_templates[template_name]
+
+    def render_header(self, context: dict) -> str:
+        return self.get_template(self.header_template).render(context)
+
+    def render_rows(self, fields: list[str], columns_cells: list[list[str]]) -> str:
+        template = self.get_template(self.row_template)
+        columns_cells = self.render_cells(fields, columns_cells)
+        return "".join(
+            [
+                template.render(
+                    {"cells": [SafeString(cell) for cell in cells], "fields": fields}
+                )
+                for cells in zip(*columns_cells)
+            ]
+        )
+
+    def render_footer(self, fields: list[str], cells: list[str]) -> str:
+        return self.get_template(self.footer_template).render(
+            {"cells": [SafeString(cell) for cell in cells], "fields": fields}
+        )
+
+
+DEFAULT_RENDERER = StringRenderer()
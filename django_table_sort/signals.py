@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after rendering a table with instrumentation enabled, with the
+# ``table`` and its ``metrics`` as arguments.
+table_rendered = Signal()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from urllib.parse import urlencode
+
+from django.http import QueryDict
+
+
+class SortState:
+    """
+    The sort lookups of a request, parsed once to generate the sort urls.
+
+    :param query: ``QueryDict`` with the url lookups of the request.
+    :param sort_key_name: ``str`` for the key name used for the sort lookups.
+    :param ignored_keys: ``list`` of keys removed from the generated urls.
+    """
+
+    def __init__(
+        self,
+        query: QueryDict,
+        sort_key_name: str,
+        ignored_keys: None | list[str] = None,
+    ) -> None:
+        self.sort_key_name = sort_key_name
+        ignored_keys = ignored_keys or []
+        self.has_sort = sort_key_name in query
+        self.order: list[str] = query.getlist(sort_key_name, [])
+        prefix, suffix = [], []
+        current = prefix
+        for key, values in query.lists():
+            if key == sort_key_name:
+                current = suffix
+                continue
+            if key in ignored_keys:
+                continue
+            current.extend((key, value) for value in values)
+        self.prefix = urlencode(prefix)
+        self.suffix = urlencode(suffix)
+        self.positions: dict[str, tuple[int, bool]] = {}
+        for position, lookup in enumerate(self.order):
+            descending = lookup.startswith("-")
+            field = lookup[1:] if descending else lookup
+            self.positions.setdefault(field, (position, descending))
+
+    def get_direction(self, field: str) -> None | bool:
+        """Return ``True`` if the field is sorted descending, ``None`` if unsorted."""
+        if field not in self.positions:
+            return None
+        return self.positions[field][1]
+
+    def encode(self, order: list[str]) -> str:
+        """Return the url lookups using the given sort lookups."""
+        sort = urlencode([(self.sort_key_name, lookup) for lookup in order])
+        return "&".join(part for part in (self.prefix, sort, self.suffix) if part)
+
+    def get_sort_url(self, field: str) -> tuple[str, str, bool, bool]:
+        """Generate the urls to sort the table for the given field."""
+        if not self.has_sort:
+            return self.encode([field]), self.encode([]), True, True
+        if field not in self.positions:
+            return (
+                self.encode(self.order + [field]),
+                self.encode(self.order),
+                True,
+                True,
+            )
+        position, descending = self.positions[field]
+        current_order = self.order.copy()
+        current_order[position] = field if descending else f"-{field}"
+        removed_order = self.order[:position] + self.order[position + 1 :]
+        return (
+            self.encode(current_order),
+            self.encode(removed_order),
+            False,
+            descending,
+        )
@@ -1,26 +1,121 @@
 from __future__ import annotations
 
+import asyncio
+import datetime
+import hashlib
+import inspect
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from functools import partial
+from operator import itemgetter
+from typing import AsyncIterator
+from typing import Callable
+from typing import Iterator
 
+import django
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.exceptions import EmptyResultSet
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count
+from django.db.models import Max
 from django.db.models import QuerySet
+from django.db.models.constants import LOOKUP_SEP
 from django.http import HttpRequest
 from django.template.loader import render_to_string
+from django.utils.http import quote_etag
 
+from django_table_sort.aggregates import aggregate_objects
+from django_table_sort.aggregates import AGGREGATES
+from django_table_sort.aggregates import get_aggregate_name
+from django_table_sort.cache import cache_stats
+from django_table_sort.cache import get_model_versions
+from django_table_sort.cache import TABLE_KEY_PREFIX
+from django_table_sort.cache import watch_models
+from django_table_sort.columnar import ColumnarData
+from django_table_sort.columns import BaseColumn
 from django_table_sort.columns import EMPTY_COLUMN
 from django_table_sort.columns import EmptyColumn
+from django_table_sort.columns import TableBatchColumn
 from django_table_sort.columns import TableColumn
 from django_table_sort.columns import TableExtraColumn
+from django_table_sort.counting import CappedCount
+from django_table_sort.counting import get_count_strategy
+from django_table_sort.counting import TableCount
+from django_table_sort.export import export_csv
+from django_table_sort.export import EXPORT_FORMATS
+from django_table_sort.export import export_jsonl
+from django_table_sort.export import export_xlsx
+from django_table_sort.formatters import escape_cells
+from django_table_sort.formatters import format_value
+from django_table_sort.formatters import get_field_formatter
 from django_table_sort.helpers import EmptyColumnGenerator
+from django_table_sort.helpers import get_field_attribute
+from django_table_sort.helpers import get_field_header
+from django_table_sort.helpers import get_function_name
+from django_table_sort.helpers import iter_batches
+from django_table_sort.helpers import resolve_lookup
+from django_table_sort.indexes import is_indexed_ordering
+from django_table_sort.instrumentation import RenderMetrics
+from django_table_sort.pagination import clean_cursor_values
+from django_table_sort.pagination import decode_cursor
+from django_table_sort.pagination import encode_cursor
+from django_table_sort.pagination import get_cursor_value
+from django_table_sort.pagination import get_keyset_filter
+from django_table_sort.pagination import get_keyset_ordering_expressions
+from django_table_sort.pagination import get_lookup_field
+from django_table_sort.pagination import KeysetPage
+from django_table_sort.renderers import DEFAULT_RENDERER
+from django_table_sort.signals import table_rendered
+from django_table_sort.sorting import SortState
 
 ALL_FIELDS = ["__all__"]
+DEFAULT_BATCH_SIZE = 1000
+BODY_PLACEHOLDER = "<!--django-table-sort-body-->"
+
+
+_thread_pools: dict[int, ThreadPoolExecutor] = {}
+_thread_pools_lock = threading.Lock()
+
+
+def _no_value(instance) -> None:
+    return None
+
+
+def get_thread_pool(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Return the pool of threads of the process with ``max_workers`` threads.
+
+    The pools are shared by all the renders, so the calls still running after
+    the threaded_timeout can't add more threads than ``max_workers``.
+    """
+    with _thread_pools_lock:
+        if max_workers not in _thread_pools:
+            _thread_pools[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="django-table-sort"
+            )
+        return _thread_pools[max_workers]
 
 
 class TableSort:
     """
     Class to generate the table with the sort.
 
+    The table is lazy: the columns are created on the first access to
+    ``column_names`` and the objects are only fetched when the table is
+    rendered, so creating a table that is never displayed costs nearly nothing.
+
     :param request: current ``HttpRequest`` to get the url lookups to create the links.
-    :param object_list: ``QuerySet`` or ``list`` to fill the table.
+    :param object_list: ``QuerySet`` or ``list`` to fill the table. Data stored by
+        columns, like a ``dict`` of lists or arrays, a pandas ``DataFrame``, a
+        NumPy structured array or a :class:`ColumnarData`, is also accepted and
+        rendered a column at a time.
     :param fields: ``list`` This field sets which fields should be displayed, the
         default value is ["__all__"] that will display all the fields in the model
         and the verbose_name of them as the header of the columns. You can use the
@@ -51,9 +146,101 @@ class TableSort:
             Note that field_identifier is to mark a difference to the models fields
             and callable_function needs to be a function that will receive an
             object and return an str to print in the table column.
+        * **batch_added_columns** (``list``) -- Extra columns to show in the table,
+            like added_columns, but the callable_function will receive a
+            ``list`` of objects and should return a ``list`` with the value of
+            every object, or a ``dict`` mapping their primary keys to the values.
+            This allows to get the values of all the objects in a batch with a
+            single query.
+        * **threaded_columns** (``list``) -- Field identifiers of the
+            added_columns whose functions are called in a pool of threads, for
+            all the objects of a batch at once. Useful for functions waiting on
+            I/O, like a cache server or an HTTP service, that shouldn't query
+            the database. The order of the rows is preserved.
+        * **max_workers** (``int``) -- Maximum number of threads used for
+            the threaded_columns, default=``8``. The tables with the same
+            max_workers share a pool of threads in the process.
+        * **threaded_timeout** (``float``) -- Maximum seconds to wait for the
+            threaded_columns in a render, default=``None`` that waits for all
+            the values. The cells not computed in time show the
+            threaded_fallback, and their calls keep running in the pool.
+        * **threaded_fallback** -- Value of the cells of the threaded_columns
+            not computed before the threaded_timeout, default=``""``.
+        * **batch_size** (``int``) -- Number of objects passed at once to the
+            functions of the batch_added_columns, default=``1000``. When
+            streaming, the chunk_size is used instead.
+        * **footer_aggregates** (``dict``) -- Aggregates to show in the footer
+            of the table, having the fields as keys and the aggregates as
+            values. The aggregates can be ``Sum``, ``Avg``, ``Min``, ``Max`` or
+            ``Count`` from ``django.db.models``, or their names in lowercase.
+            Querysets compute all of them in a single query over all the
+            objects, ignoring the pagination, and lists in a single pass.
+        * **last_modified_field** (``str``) -- ``DateTimeField`` or
+            ``DateField`` of the model with the date of the last modification
+            of the objects, used to compute the fingerprint of the data and the
+            ``Last-Modified`` of the table. The ETag of the table requires this
+            parameter or the version.
+        * **version** (``callable``) -- Function receiving the table and
+            returning a value that changes when the displayed data changes,
+            added to the fingerprint of the data.
+        * **excluded_url_lookups** (``list``) -- Keys of the url lookups that
+            shouldn't be kept in the urls generated by the table.
+        * **column_formatters** (``dict``) -- Functions to format the values
+            of the columns, having the fields as keys and functions receiving
+            a value and returning the text of the cell as values. By default
+            the choices of the model fields are displayed with their label and
+            the booleans, dates and decimals are formatted as in the templates.
+            The text of the cells is escaped unless it's a safe string, like
+            the result of ``format_html``.
+        * **renderer** (``TableRenderer``) -- Renderer generating the HTML of
+            the headers and the rows, default to a ``StringRenderer`` that
+            builds it with string operations. A ``TemplateRenderer`` uses
+            templates instead, see ``django_table_sort.renderers``.
         * **column_headers_css_classes** -- CSS classes to be applied to the
         column headers. Should be a dictionary having the fields as keys
         and the css classes to be applied as values.
+        * **only_displayed_fields** (``bool``) -- Only fetch from the database
+            the fields displayed in the table, default=``False``. If the table
+            only shows plain model fields the rows are fetched as tuples with
+            ``values_list`` instead of model instances.
+        * **apply_ordering** (``bool``) -- Sort the objects using the sort
+            lookups in the url, default=``False``. Only the columns with sort
+            links can be used to sort, any other lookup in the url is ignored.
+            Querysets are sorted in the database and lists are sorted in Python.
+        * **sort_index_threshold** (``int``) -- Only allow sorting a
+            ``QuerySet`` by the columns with an index in the database when it
+            has more than this number of objects, default=``None`` that allows
+            sorting by any column. The other columns are displayed without sort
+            links and the sort lookups are restricted to the first fields of an
+            index, so sorting never scans the whole table.
+        * **keyset_page_size** (``int``) -- Paginate a ``QuerySet`` using keyset
+            pagination, showing this number of rows per page. The objects are
+            sorted using the sort lookups in the url and the primary key, and
+            the pages are fetched seeking the rows after the last row displayed
+            instead of using an offset, default=``None``.
+        * **cursor_key_name** (``str``) -- Key name used for the page cursor
+            in the urls, default=``"cursor"``.
+        * **instrument** (``bool``) -- Measure the time spent in every phase
+            of the render, the queries executed and the time spent in every
+            added column, default=``False``. The measurements are stored in
+            the ``metrics`` attribute and sent with the ``table_rendered``
+            signal.
+        * **instrumentation_callback** (``callable``) -- Function called with
+            the table and the measurements after every render, enables the
+            instrumentation.
+        * **cache_alias** (``str``) -- Name of the cache used to store the
+            rendered table, default=``None`` that disables the cache. Only the
+            tables displaying a ``QuerySet`` are cached, and they are invalidated
+            when the objects of the model or the related models of the columns
+            are saved or deleted.
+        * **cache_timeout** (``int``) -- Seconds to keep the rendered table in
+            the cache, default to the timeout of the cache.
+        * **count_strategy** (``str`` or ``CountStrategy``) -- Show the total
+            number of objects below the table, counted with the given strategy:
+            ``"exact"``, ``"capped"``, ``"cached"``, ``"estimated"`` or an
+            instance of the classes in ``django_table_sort.counting``,
+            default=``None`` that doesn't count the objects. The pagination of
+            the objects is ignored in the count.
     """
 
     def __init__(
@@ -71,65 +258,198 @@ class TableSort:
         **kwargs,
     ):
         self.request = request
-        self.object_list = object_list
+        self._object_list = object_list
+        self._object_list_wrapped = False
         self.sort_key_name = sort_key_name
         self.table_css_clases = table_css_clases
         self.table_id = table_id
         self.kwargs = kwargs
+        self.only_displayed_fields = kwargs.get("only_displayed_fields", False)
+        self.apply_ordering = kwargs.get("apply_ordering", False)
+        self.keyset_page_size = kwargs.get("keyset_page_size", None)
+        self.sort_index_threshold = kwargs.get("sort_index_threshold", None)
+        self._restrict_sorting = None
+        self.cursor_key_name = kwargs.get("cursor_key_name", "cursor")
+        self.cache_alias = kwargs.get("cache_alias", None)
+        self.cache_timeout = kwargs.get("cache_timeout", DEFAULT_TIMEOUT)
+        self._keyset_page = None
+        self._sort_state = None
         self.template_name = template_name
-        headers_css_classes = kwargs.get("column_headers_css_classes", {})
+        self.batch_size = kwargs.get("batch_size", DEFAULT_BATCH_SIZE)
+        self.footer_aggregates = {
+            field: get_aggregate_name(aggregate)
+            for field, aggregate in kwargs.get("footer_aggregates", {}).items()
+        }
+        self._footer_values = None
+        count_strategy = kwargs.get("count_strategy", None)
+        self.count_strategy = (
+            get_count_strategy(count_strategy) if count_strategy is not None else None
+        )
+        self._total_count = None
+        self.last_modified_field = kwargs.get("last_modified_field", None)
+        self.excluded_url_lookups = kwargs.get("excluded_url_lookups", [])
+        self.version = kwargs.get("version", None)
+        self._data_fingerprint = None
+        self.instrument = kwargs.get("instrument", False)
+        self.instrumentation_callback = kwargs.get("instrumentation_callback", None)
+        self.metrics = None
+        self._render_metrics = None
+        self.column_formatters = kwargs.get("column_formatters", {})
+        self.renderer = kwargs.get("renderer", DEFAULT_RENDERER)
+        self.threaded_columns = kwargs.get("threaded_columns", [])
+        self.max_workers = kwargs.get("max_workers", 8)
+        self.threaded_timeout = kwargs.get("threaded_timeout", None)
+        self.threaded_fallback = kwargs.get("threaded_fallback", "")
+        self._threaded_deadline = None
+        self._cell_formatters = None
+        self._column_options = (fields, exclude, column_names, field_order)
+        self._column_names = None
+        self.columns_time = 0.0
+
+    @property
+    def object_list(self) -> QuerySet | list | ColumnarData:
+        """The objects of the table, wrapped on first access if stored by columns."""
+        if not self._object_list_wrapped:
+            self._object_list = ColumnarData.wrap(self._object_list)
+            self._object_list_wrapped = True
+        return self._object_list
+
+    @object_list.setter
+    def object_list(self, object_list: QuerySet | list | ColumnarData) -> None:
+        self._object_list = object_list
+        self._object_list_wrapped = False
+
+    @property
+    def column_names(self) -> list[BaseColumn]:
+        """The columns of the table, created on first access."""
+        if self._column_names is None:
+            start = time.perf_counter()
+            self._column_names = self.get_columns(*self._column_options)
+            self.columns_time = time.perf_counter() - start
+        return self._column_names
+
+    @column_names.setter
+    def column_names(self, columns: list[BaseColumn]) -> None:
+        self._column_names = columns
+
+    def get_columns(
+        self,
+        fields: None | list,
+        exclude: None | list,
+        column_names: None | dict[str, str],
+        field_order: None | list[str],
+    ) -> list[BaseColumn]:
+        """Create the columns of the table in the display order."""
+        headers_css_classes = self.kwargs.get("column_headers_css_classes", {})
         column_names = column_names or {}
-        if exclude is not None and isinstance(object_list, QuerySet):
+        if isinstance(self.object_list, ColumnarData) and not column_names:
+            column_names = {
+                name: name.replace("_", " ").title() for name in self.object_list.names
+            }
+        if exclude is not None and isinstance(self.object_list, QuerySet):
             fields = [
                 field
-                for field in object_list.model._meta.get_fields()
+                for field in self.object_list.model._meta.get_fields()
                 if field.name not in exclude
             ]
-            self.column_names = [
-                TableColumn(
+            columns = [
+                self.get_table_column(
                     field.name,
-                    column_names.get(field.name, field.verbose_name.title()),
+                    column_names.get(field.name, get_field_header(field)),
                     headers_css_classes,
                 )
                 for field in fields
-                if not field.primary_key or kwargs.get("show_primary_key", False)
+                if not getattr(field, "primary_key", False)
+                or self.kwargs.get("show_primary_key", False)
             ]
-        elif fields is not None and isinstance(object_list, QuerySet):
+        elif fields is not None and isinstance(self.object_list, QuerySet):
+            lookups = []
             if fields == ALL_FIELDS:
-                fields = object_list.model._meta.get_fields()
+                fields = self.object_list.model._meta.get_fields()
             else:
+                lookups = [field for field in fields if LOOKUP_SEP in field]
                 fields = [
                     field
-                    for field in object_list.model._meta.get_fields()
+                    for field in self.object_list.model._meta.get_fields()
                     if field.name in fields
                 ]
-            self.column_names = [
-                TableColumn(
+            columns = [
+                self.get_table_column(
                     field.name,
-                    column_names.get(field.name, field.verbose_name.title()),
+                    column_names.get(field.name, get_field_header(field)),
                     headers_css_classes,
                 )
                 for field in fields
-                if not field.primary_key or kwargs.get("show_primary_key", False)
+                if not getattr(field, "primary_key", False)
+                or self.kwargs.get("show_primary_key", False)
+            ]
+            columns += [
+                self.get_table_column(
+                    lookup,
+                    column_names.get(
+                        lookup,
+                        get_field_header(
+                            resolve_lookup(self.object_list.model, lookup)[-1]
+                        ),
+                    ),
+                    headers_css_classes,
+                )
+                for lookup in lookups
             ]
         elif column_names is not None:
             empty_column_generator = EmptyColumnGenerator()
-            self.column_names = [
-                TableColumn(column_name, column_header, headers_css_classes)
+            columns = [
+                self.get_table_column(column_name, column_header, headers_css_classes)
                 if column_name
                 != empty_column_generator.get_next_empty_column_key_no_add()
                 else empty_column_generator.get_next_empty_column(column_header)
                 for column_name, column_header in column_names.items()
             ]
         else:
-            self.column_names = []
-        self.column_names += [
+            columns = []
+        columns += [
             TableExtraColumn(
                 column_info[0], column_info[1], column_function, headers_css_classes
             )
             for column_info, column_function in self.kwargs.get("added_columns", [])
         ]
+        columns += [
+            TableBatchColumn(
+                column_info[0], column_info[1], column_function, headers_css_classes
+            )
+            for column_info, column_function in self.kwargs.get(
+                "batch_added_columns", []
+            )
+        ]
+        self.column_names = columns
         self.sort_columns(field_order)
+        return self.column_names
+
+    def get_table_column(
+        self, column_field: str, column_header: str, css_classes: dict
+    ) -> TableColumn:
+        """Create the column for the field, resolving it against the model."""
+        if isinstance(self.object_list, QuerySet):
+            try:
+                fields = resolve_lookup(self.object_list.model, column_field)
+            except FieldDoesNotExist:
+                pass
+            else:
+                many_valued = any(
+                    field.many_to_many or field.one_to_many for field in fields
+                )
+                nullable = any(getattr(field, "null", True) for field in fields)
+                return TableColumn(
+                    column_field,
+                    column_header,
+                    css_classes,
+                    attributes=[get_field_attribute(field) for field in fields],
+                    many_valued=many_valued,
+                    formatter=format_value
+                    if many_valued
+                    else get_field_formatter(fields[-1], nullable),
+                )
+        return TableColumn(column_field, column_header, css_classes)
 
     def __str__(self):
         """Returns the table in HTML format."""
@@ -137,81 +457,1071 @@ class TableSort:
 
     def render(self) -> str:
         """Generate the table with the sort."""
+        if not self.use_cache():
+            return self.render_table()
+        cache = caches[self.cache_alias]
+        cache_key = self.get_cache_key()
+        result = cache.get(cache_key)
+        if result is not None:
+            cache_stats.hit()
+            return result
+        cache_stats.miss()
+        result = self.render_table()
+        cache.set(cache_key, result, self.cache_timeout)
+        return result
+
+    def render_table(self) -> str:
+        """Render the table, measuring the render if instrumentation is enabled."""
+        self._threaded_deadline = None
+        if not self.instrument and self.instrumentation_callback is None:
+            return self.render_with_body(self.get_table_body())
+        metrics = RenderMetrics()
+        column_names = self.column_names
+        metrics.phases["columns"] = self.columns_time
+        if isinstance(self.object_list, QuerySet):
+            connection = connections[self.object_list.db]
+        else:
+            connection = connections[DEFAULT_DB_ALIAS]
+        with connection.execute_wrapper(metrics.count_query):
+            start = time.perf_counter()
+            object_list = list(self.get_object_list())
+            metrics.phases["fetch"] = time.perf_counter() - start
+            # The batch and threaded columns are timed around all their values.
+            accessors = tuple(
+                metrics.time_column(column.column_field, accessor)
+                if isinstance(column, TableExtraColumn)
+                and not isinstance(column, TableBatchColumn)
+                and not self.is_threaded_column(column)
+                else accessor
+                for column, accessor in zip(column_names, self.get_row_accessors())
+            )
+            start = time.perf_counter()
+            self._render_metrics = metrics
+            try:
+                body = "".join(
+                    [
+                        self.get_table_rows(batch, accessors)
+                        for batch in iter_batches(object_list, self.batch_size)
+                    ]
+                )
+            finally:
+                self._render_metrics = None
+            metrics.phases["body"] = time.perf_counter() - start
+            start = time.perf_counter()
+            headers = self.get_table_headers()
+            metrics.phases["headers"] = time.perf_counter() - start
+            start = time.perf_counter()
+            result = self.render_with_body(body, headers)
+            metrics.phases["template"] = time.perf_counter() - start
+        self.metrics = metrics
+        table_rendered.send(sender=type(self), table=self, metrics=metrics)
+        if self.instrumentation_callback is not None:
+            self.instrumentation_callback(self, metrics)
+        return result
+
+    def use_cache(self) -> bool:
+        """Check if the rendered table is stored in the cache."""
+        return self.cache_alias is not None and isinstance(self.object_list, QuerySet)
+
+    def get_cache_models(self) -> list:
+        """Return the models whose changes invalidate the cached table."""
+        models = [self.object_list.model]
+        for column in self.column_names:
+            if not isinstance(column, TableColumn):
+                continue
+            try:
+                fields = resolve_lookup(self.object_list.model, column.column_field)
+            except FieldDoesNotExist:
+                continue
+            for field in fields:
+                if field.is_relation and field.related_model not in models:
+                    models.append(field.related_model)
+        return models
+
+    def get_cache_key(self) -> str:
+        """
+        Return the key of the rendered table in the cache.
+
+        The key is derived from the query, the columns, the sort lookups and the
+        version of the displayed models, that changes when their objects change.
+        """
+        models = self.get_cache_models()
+        watch_models(models, self.cache_alias)
+        key_parts = (
+            self.get_query_sql(),
+            self.get_render_key_parts(),
+            get_model_versions(models, self.cache_alias),
+        )
+        digest = hashlib.sha256(repr(key_parts).encode()).hexdigest()
+        return f"{TABLE_KEY_PREFIX}:{digest}"
+
+    def get_query_sql(self) -> tuple[str, tuple]:
+        """Return the sql and the params of the query, if the objects are a query."""
+        if not isinstance(self.object_list, QuerySet):
+            return "", ()
+        try:
+            return self.object_list.query.sql_with_params()
+        except EmptyResultSet:
+            return "", ()
+
+    def get_render_key_parts(self) -> tuple:
+        """Return the options and url lookups that change the rendered table."""
+        columns = [
+            (
+                type(column).__name__,
+                column.column_field,
+                column.column_header,
+                column.css_classes,
+                get_function_name(column.function)
+                if isinstance(column, TableExtraColumn)
+                else "",
+                get_function_name(formatter),
+            )
+            for column, formatter in zip(self.column_names, self.get_cell_formatters())
+        ]
+        if self.request is not None:
+            sort_state = self.get_sort_state()
+            query = (
+                sort_state.prefix,
+                sort_state.order,
+                sort_state.suffix,
+                self.request.GET.getlist(self.cursor_key_name),
+            )
+        else:
+            query = ()
+        return (
+            columns,
+            query,
+            self.sort_key_name,
+            self.table_css_clases,
+            self.table_id,
+            self.template_name,
+            self.apply_ordering,
+            self.keyset_page_size,
+            self.sort_index_threshold,
+            type(self.renderer).__name__,
+            sorted(self.renderer.cell_templates.items()),
+            self.cursor_key_name,
+            self.footer_aggregates,
+            type(self.count_strategy).__name__,
+        )
+
+    def get_data_fingerprint(self) -> tuple:
+        """
+        Return a cheap fingerprint of the displayed data, computed once.
+
+        For a ``QuerySet`` it's the number of objects and the latest value of the
+        last_modified_field, computed in a single query over all the objects.
+        It also contains the result of the version function, if given.
+        """
+        if self._data_fingerprint is not None:
+            return self._data_fingerprint
+        if isinstance(self.object_list, QuerySet):
+            object_list = self.object_list.all()
+            object_list.query.clear_limits()
+            aggregates = {"count": Count("pk")}
+            if self.last_modified_field is not None:
+                aggregates["last_modified"] = Max(self.last_modified_field)
+            values = object_list.order_by().aggregate(**aggregates)
+            fingerprint = (values["count"], values.get("last_modified"))
+        else:
+            fingerprint = (len(self.object_list), None)
+        version = self.version(self) if self.version is not None else None
+        self._data_fingerprint = (*fingerprint, version)
+        return self._data_fingerprint
+
+    def get_etag(self) -> None | str:
+        """
+        Return an ETag for the rendered table.
+
+        The ETag is derived from the query, the columns, the sort lookups and the
+        fingerprint of the data, without fetching the objects. The number of
+        objects alone doesn't change when an object is edited, so ``None`` is
+        returned unless the last_modified_field or the version is given.
+        """
+        if self.last_modified_field is None and self.version is None:
+            return None
+        etag_parts = (
+            self.get_query_sql(),
+            self.get_render_key_parts(),
+            self.get_data_fingerprint(),
+        )
+        return quote_etag(hashlib.sha256(repr(etag_parts).encode()).hexdigest())
+
+    def get_last_modified(self) -> None | datetime.datetime:
+        """
+        Return the latest value of the last_modified_field of the objects.
+
+        The value of a ``DateField`` is returned as the start of the day in UTC.
+        """
+        if self.last_modified_field is None:
+            return None
+        last_modified = self.get_data_fingerprint()[1]
+        if last_modified is None or isinstance(last_modified, datetime.datetime):
+            return last_modified
+        if isinstance(last_modified, datetime.date):
+            return datetime.datetime.combine(
+                last_modified, datetime.time.min, tzinfo=datetime.timezone.utc
+            )
+        raise ValueError(
+            f"The last_modified_field {self.last_modified_field!r} should be a "
+            "DateField or a DateTimeField."
+        )
+
+    def get_total_count(self) -> None | TableCount:
+        """
+        Return the total number of objects, computed once.
+
+        The objects of a ``QuerySet`` are counted with the count_strategy,
+        ignoring the pagination. ``None`` is returned if there isn't a strategy.
+        """
+        if self.count_strategy is None:
+            return None
+        if self._total_count is None:
+            if isinstance(self.object_list, QuerySet):
+                object_list = self.object_list.all()
+                object_list.query.clear_limits()
+                self._total_count = self.count_strategy.count(object_list.order_by())
+            else:
+                self._total_count = TableCount(len(self.object_list))
+        return self._total_count
+
+    async def aget_total_count(self) -> None | TableCount:
+        """Return the total number of objects in an async view."""
+        return await sync_to_async(self.get_total_count)()
+
+    def render_headers(self) -> str:
+        """Generate only the ``<thead>`` of the table."""
+        return f"<thead><tr>{self.get_table_headers()}</tr></thead>"
+
+    def render_body(self) -> str:
+        """Generate only the ``<tbody>`` of the table."""
+        return f"<tbody>{self.get_table_body()}</tbody>"
+
+    def render_rows(self, start: int = 0, stop: None | int = None) -> str:
+        """
+        Generate only the rows of the table between ``start`` and ``stop``.
+
+        The objects are sorted as in the table before taking the rows, and a
+        ``QuerySet`` only fetches the rows requested.
+        """
+        self._threaded_deadline = None
+        object_list = self.get_object_list()
+        if isinstance(object_list, ColumnarData):
+            return self.get_columnar_body(object_list.slice(start, stop))
+        return "".join(
+            [
+                self.get_table_rows(batch, self.get_row_accessors())
+                for batch in iter_batches(object_list[start:stop], self.batch_size)
+            ]
+        )
+
+    def render_with_body(self, body: str, headers: None | str = None) -> str:
+        """Render the table template using the given body."""
         return render_to_string(
             self.template_name,
             {
-                "body": self.get_table_body(),
-                "headers": self.get_table_headers(),
+                "body": body,
+                "headers": headers if headers is not None else self.get_table_headers(),
+                "footer": self.get_table_footer(),
                 "table_clases": str(f' class="{self.table_css_clases}"')
                 if self.table_css_clases is not None
                 else "",
                 "table_id": f' id="{self.table_id}"'
                 if self.table_id is not None
                 else "",
+                "previous_page_url": self.get_previous_page_url(),
+                "next_page_url": self.get_next_page_url(),
+                "total_count": self.get_total_count(),
             },
         )
 
+    def stream(self, chunk_size: int = 2000) -> Iterator[str]:
+        """
+        Generate the table with the sort in chunks.
+
+        The table is rendered with the template as usual, but the body is
+        yielded in batches of ``chunk_size`` rows, so the result can be passed
+        to a ``StreamingHttpResponse`` without holding the whole table in memory.
+        """
+        self._threaded_deadline = None
+        start, _, end = self.render_with_body(BODY_PLACEHOLDER).partition(
+            BODY_PLACEHOLDER
+        )
+        yield start
+        accessors = self.get_row_accessors()
+        for batch in iter_batches(self.iter_objects(chunk_size), chunk_size):
+            yield self.get_table_rows(batch, accessors)
+        yield end
+
+    async def arender(self, chunk_size: int = 2000) -> str:
+        """
+        Generate the table with the sort in an async view.
+
+        The objects are fetched using the async interface of the ``QuerySet``
+        and the added columns can use async functions.
+        """
+        return "".join([chunk async for chunk in self.astream(chunk_size)])
+
+    async def astream(self, chunk_size: int = 2000) -> AsyncIterator[str]:
+        """
+        Generate the table with the sort in chunks in an async view.
+
+        The async version of :meth:`stream`, the result can be passed to a
+        ``StreamingHttpResponse`` under ASGI. The async functions of the added
+        columns are awaited concurrently for all the rows in a batch. It requires
+        Django 4.1 or later, where the ``QuerySet`` has an async interface.
+        """
+        if django.VERSION < (4, 1):
+            raise RuntimeError("The async rendering requires Django 4.1 or later.")
+        self._threaded_deadline = None
+        await self.arestrict_sorting()
+        if self.use_keyset_pagination():
+            await self.aget_keyset_page()
+        await self.aget_total_count()
+        if self.footer_aggregates:
+            await self.aget_footer_values()
+        start, _, end = self.render_with_body(BODY_PLACEHOLDER).partition(
+            BODY_PLACEHOLDER
+        )
+        yield start
+        accessors = self.get_row_accessors()
+        batch: list = []
+        async for obj in self.aiter_objects(chunk_size):
+            batch.append(obj)
+            if len(batch) >= chunk_size:
+                yield await self.aget_table_rows(batch, accessors)
+                batch = []
+        if batch:
+            yield await self.aget_table_rows(batch, accessors)
+        yield end
+
+    async def aiter_objects(self, chunk_size: int = 2000) -> AsyncIterator:
+        """Iterate over the objects using the async interface of the ``QuerySet``."""
+        object_list = await self.aget_object_list()
+        if not isinstance(object_list, QuerySet):
+            for obj in object_list:
+                yield obj
+        elif (
+            object_list._result_cache is not None
+            or object_list._prefetch_related_lookups
+        ):
+            async for obj in object_list:
+                yield obj
+        else:
+            async for obj in object_list.aiterator(chunk_size=chunk_size):
+                yield obj
+
+    async def aget_object_list(self) -> QuerySet | list:
+        """
+        Return the objects to display in an async view.
+
+        A sliced ``QuerySet`` sorted in Python is fetched using the async
+        interface before sorting it.
+        """
+        object_list = self.object_list
+        if (
+            self.apply_ordering
+            and isinstance(object_list, QuerySet)
+            and object_list.query.is_sliced
+            and object_list._result_cache is None
+        ):
+            ordering = self.get_ordering()
+            if ordering:
+                objects = [obj async for obj in self.prepare_queryset(object_list)]
+                return self.sort_object_list(objects, ordering)
+        return self.get_object_list()
+
+    async def aget_table_rows(self, objects: list, accessors: tuple[Callable, ...]):
+        """Generate the rows of the objects, awaiting the async values together."""
+        rows = self.get_rows_values(objects, accessors)
+        pending = [
+            (row, position)
+            for row in rows
+            for position, value in enumerate(row)
+            if inspect.isawaitable(value)
+        ]
+        if pending:
+            values = await asyncio.gather(*[row[position] for row, position in pending])
+            for (row, position), value in zip(pending, values):
+                row[position] = value
+        return self.format_rows(rows)
+
+    def export(self, format: str = "csv", chunk_size: int = 2000) -> Iterator:
+        """
+        Generate the table as a file to download in chunks.
+
+        The file has the same columns and headers of the table and the objects
+        are sorted the same way, but all of them are exported even if the table
+        uses keyset pagination. The result can be passed to a
+        ``StreamingHttpResponse``.
+
+        :param format: ``str`` format of the file, one of ``"csv"``, ``"jsonl"``
+            or ``"xlsx"``. The ``"xlsx"`` format requires ``xlsxwriter``.
+        :param chunk_size: ``int`` number of rows fetched and written at once.
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unknown export format {format!r}, "
+                f"the available formats are {', '.join(EXPORT_FORMATS)}."
+            )
+        async_columns = [
+            column.column_field
+            for column in self.column_names
+            if isinstance(column, TableExtraColumn)
+            and (
+                inspect.iscoroutinefunction(column.function)
+                or inspect.iscoroutinefunction(type(column.function).__call__)
+            )
+        ]
+        if async_columns:
+            raise ValueError(
+                f"The added columns {', '.join(async_columns)} are async and "
+                "can't be exported."
+            )
+        rows = self.iter_export_rows(chunk_size)
+        if format == "csv":
+            headers = [column.column_header for column in self.column_names]
+            return export_csv(headers, rows, chunk_size)
+        if format == "jsonl":
+            fields = [column.column_field for column in self.column_names]
+            return export_jsonl(fields, rows, chunk_size)
+        headers = [column.column_header for column in self.column_names]
+        return export_xlsx(headers, rows)
+
+    def iter_export_rows(self, chunk_size: int = 2000) -> Iterator[list]:
+        """Iterate over the values of every row of the exported table."""
+        self._threaded_deadline = None
+        if self.use_keyset_pagination():
+            object_list = self.prepare_queryset(
+                self.object_list.order_by(*self.get_keyset_ordering())
+            )
+        else:
+            object_list = self.get_object_list()
+        accessors = self.get_row_accessors()
+        for batch in iter_batches(
+            self.iter_objects(chunk_size, object_list), chunk_size
+        ):
+            yield from self.get_rows_values(batch, accessors)
+
+    def iter_objects(
+        self, chunk_size: int = 2000, object_list: None | QuerySet | list = None
+    ) -> Iterator:
+        """Iterate over the objects, without caching them if it's a ``QuerySet``."""
+        if object_list is None:
+            object_list = self.get_object_list()
+        if isinstance(object_list, QuerySet):
+            if object_list._result_cache is not None:
+                return iter(object_list)
+            return object_list.iterator(chunk_size=chunk_size)
+        return iter(object_list)
+
+    def get_projected_fields(self) -> list[str]:
+        """Return the displayed columns that are concrete fields of the model."""
+        projected_fields = []
+        for column in self.column_names:
+            if not isinstance(column, TableColumn):
+                continue
+            try:
+                fields = resolve_lookup(self.object_list.model, column.column_field)
+            except FieldDoesNotExist:
+                continue
+            if all(field.concrete for field in fields):
+                projected_fields.append(column.column_field)
+        return projected_fields
+
+    def get_related_lookups(self) -> tuple[list[str], list[str]]:
+        """
+        Return the lookups to pass to ``select_related`` and ``prefetch_related``.
+
+        Forward foreign keys and one-to-one relations of the displayed columns
+        are joined with ``select_related``, and many-valued relations are
+        fetched with ``prefetch_related``, along with the relations after them.
+        """
+        select_related, prefetch_related = [], []
+        for column in self.column_names:
+            if not isinstance(column, TableColumn):
+                continue
+            try:
+                fields = resolve_lookup(self.object_list.model, column.column_field)
+            except FieldDoesNotExist:
+                continue
+            select_path, prefetch_path = [], []
+            for field in fields:
+                if not field.is_relation:
+                    break
+                select_path.append(field.name)
+                prefetch_path.append(get_field_attribute(field))
+            if column.many_valued:
+                prefetch_related.append(LOOKUP_SEP.join(prefetch_path))
+            elif select_path:
+                select_related.append(LOOKUP_SEP.join(select_path))
+        return select_related, prefetch_related
+
+    def use_values_list(self) -> bool:
+        """Check if the rows can be fetched as tuples instead of instances."""
+        if (
+            not self.only_displayed_fields
+            or not isinstance(self.object_list, QuerySet)
+            or self.use_keyset_pagination()
+        ):
+            return False
+        projected_fields = self.get_projected_fields()
+        for column in self.column_names:
+            if isinstance(column, EmptyColumn):
+                continue
+            if not isinstance(column, TableColumn):
+                return False
+            if column.column_field not in projected_fields:
+                return False
+            fields = resolve_lookup(self.object_list.model, column.column_field)
+            if fields[-1].is_relation:
+                return False
+        return True
+
+    def get_sortable_columns(self) -> dict[str, TableColumn]:
+        """Return the columns that can be used to sort the objects."""
+        sortable_columns = {}
+        for column in self.column_names:
+            if not isinstance(column, TableColumn):
+                continue
+            if isinstance(self.object_list, QuerySet):
+                if column.many_valued:
+                    continue
+                try:
+                    resolve_lookup(self.object_list.model, column.column_field)
+                except FieldDoesNotExist:
+                    continue
+                if self.restrict_sorting() and not is_indexed_ordering(
+                    self.object_list.model, [column.column_field]
+                ):
+                    continue
+            if isinstance(self.object_list, ColumnarData):
+                if column.column_field not in self.object_list.columns:
+                    continue
+            sortable_columns[column.column_field] = column
+        return sortable_columns
+
+    def get_ordering(self) -> list[str]:
+        """Return the sort lookups in the url that match a sortable column."""
+        if self.request is None:
+            return []
+        sortable_columns = self.get_sortable_columns()
+        restrict_sorting = self.restrict_sorting()
+        ordering = []
+        for lookup in self.get_sort_state().order:
+            field = lookup[1:] if lookup.startswith("-") else lookup
+            if field not in sortable_columns:
+                continue
+            if field in ordering or f"-{field}" in ordering:
+                continue
+            if restrict_sorting and not is_indexed_ordering(
+                self.object_list.model, [*ordering, lookup]
+            ):
+                break
+            ordering.append(lookup)
+        return ordering
+
+    def restrict_sorting(self) -> bool:
+        """
+        Check if only the indexed columns can be used to sort the objects.
+
+        The objects are counted up to the sort_index_threshold, only once.
+        Sliced querysets are sorted in Python and never restricted.
+        """
+        if self.sort_index_threshold is None:
+            return False
+        if not isinstance(self.object_list, QuerySet):
+            return False
+        if self.object_list.query.is_sliced:
+            return False
+        if self._restrict_sorting is None:
+            count = CappedCount(self.sort_index_threshold).count(
+                self.object_list.order_by()
+            )
+            self._restrict_sorting = count.capped
+        return self._restrict_sorting
+
+    async def arestrict_sorting(self) -> bool:
+        """Check if only the indexed columns can sort the objects in an async view."""
+        return await sync_to_async(self.restrict_sorting)()
+
+    def sort_object_list(self, object_list: list, ordering: list[str]) -> list:
+        """
+        Sort a list of objects using the given sort lookups.
+
+        The ``None`` values are placed last in both directions, and the related
+        objects are sorted by their primary key, as in the cursors.
+        """
+        if isinstance(object_list, ColumnarData):
+            return object_list.sort(ordering)
+        sortable_columns = self.get_sortable_columns()
+        object_list = list(object_list)
+        for lookup in reversed(ordering):
+            descending = lookup.startswith("-")
+            field = lookup[1:] if descending else lookup
+            accessor = sortable_columns[field].get_accessor()
+
+            def _get_sort_key(obj, accessor=accessor, descending=descending) -> tuple:
+                """Get the sort key of the object, placing the nulls last."""
+                value = get_cursor_value(accessor(obj))
+                # The reversed sort would place the nulls first, so flip the flag.
+                return (value is None) != descending, value
+
+            object_list.sort(key=_get_sort_key, reverse=descending)
+        return object_list
+
+    def use_keyset_pagination(self) -> bool:
+        """Check if the objects are paginated using keyset pagination."""
+        return (
+            self.keyset_page_size is not None
+            and isinstance(self.object_list, QuerySet)
+            and not self.object_list.query.is_sliced
+        )
+
+    def get_keyset_ordering(self) -> list[str]:
+        """Return the sort lookups used for keyset pagination."""
+        ordering = self.get_ordering()
+        pk_name = self.object_list.model._meta.pk.name
+        if not any(lookup.lstrip("-") in ("pk", pk_name) for lookup in ordering):
+            ordering.append("pk")
+        return ordering
+
+    def get_cursor(self, obj, ordering: list[str], reverse: bool = False) -> str:
+        """Return the cursor pointing to the given object."""
+        sortable_columns = self.get_sortable_columns()
+        values = []
+        for lookup in ordering:
+            field = lookup.lstrip("-")
+            if field in sortable_columns:
+                value = sortable_columns[field].get_value(obj)
+            else:
+                value = obj.pk
+            values.append(get_cursor_value(value))
+        return encode_cursor(values, reverse)
+
+    def get_keyset_page(self) -> KeysetPage:
+        """Return the current page when using keyset pagination."""
+        if self._keyset_page is None:
+            object_list, ordering, has_cursor, reverse = self.get_keyset_queryset()
+            self._keyset_page = self.create_keyset_page(
+                list(object_list), ordering, has_cursor, reverse
+            )
+        return self._keyset_page
+
+    async def aget_keyset_page(self) -> KeysetPage:
+        """Return the current page when using keyset pagination."""
+        if self._keyset_page is None:
+            object_list, ordering, has_cursor, reverse = self.get_keyset_queryset()
+            self._keyset_page = self.create_keyset_page(
+                [obj async for obj in object_list], ordering, has_cursor, reverse
+            )
+        return self._keyset_page
+
+    def get_keyset_queryset(self) -> tuple[QuerySet, list[str], bool, bool]:
+        """
+        Return the queryset to fetch the current page when using keyset pagination.
+
+        The queryset fetches one row more than the page size to know if there are
+        more rows. It's returned with the ordering, if a cursor was given, and if
+        the cursor points to the previous page, fetching the rows in reverse.
+        """
+        ordering = self.get_keyset_ordering()
+        cursor = None
+        if self.request is not None:
+            cursor = self.request.GET.get(self.cursor_key_name)
+        cursor = decode_cursor(cursor) if cursor else None
+        model = self.object_list.model
+        object_list = self.object_list
+        reverse = False
+        if cursor is not None:
+            values = clean_cursor_values(model, ordering, cursor[0])
+            cursor = (values, cursor[1]) if values is not None else None
+        if cursor is not None:
+            values, reverse = cursor
+            nullable = [
+                lookup.lstrip("-")
+                for lookup in ordering
+                if get_lookup_field(model, lookup)[1]
+            ]
+            object_list = object_list.filter(
+                get_keyset_filter(ordering, values, reverse, nullable)
+            )
+        object_list = object_list.order_by(
+            *get_keyset_ordering_expressions(model, ordering, reverse)
+        )
+        object_list = self.prepare_queryset(object_list)
+        return (
+            object_list[: self.keyset_page_size + 1],
+            ordering,
+            cursor is not None,
+            reverse,
+        )
+
+    def create_keyset_page(
+        self, objects: list, ordering: list[str], has_cursor: bool, reverse: bool
+    ) -> KeysetPage:
+        """Create the page from the objects fetched by the keyset queryset."""
+        has_more = len(objects) > self.keyset_page_size
+        objects = objects[: self.keyset_page_size]
+        if reverse:
+            objects.reverse()
+        has_next = has_more if not reverse else True
+        has_previous = has_cursor if not reverse else has_more
+        return KeysetPage(
+            objects,
+            next_cursor=self.get_cursor(objects[-1], ordering)
+            if has_next and objects
+            else None,
+            previous_cursor=self.get_cursor(objects[0], ordering, reverse=True)
+            if has_previous and objects
+            else None,
+        )
+
+    def get_page_url(self, cursor: None | str) -> None | str:
+        """Return the url to the page pointed by the cursor."""
+        if cursor is None or self.request is None:
+            return None
+        lookups = self.request.GET.copy()
+        for key in self.excluded_url_lookups:
+            lookups.pop(key, None)
+        lookups[self.cursor_key_name] = cursor
+        return lookups.urlencode()
+
+    def get_next_page_url(self) -> None | str:
+        """Return the url to the next page when using keyset pagination."""
+        if not self.use_keyset_pagination():
+            return None
+        return self.get_page_url(self.get_keyset_page().next_cursor)
+
+    def get_previous_page_url(self) -> None | str:
+        """Return the url to the previous page when using keyset pagination."""
+        if not self.use_keyset_pagination():
+            return None
+        return self.get_page_url(self.get_keyset_page().previous_cursor)
+
+    def get_object_list(self) -> QuerySet | list:
+        """
+        Return the objects to display.
+
+        The objects are sorted if apply_ordering is set. Querysets also fetch the
+        related objects of the displayed columns and apply the projection if
+        enabled.
+        """
+        if self.use_keyset_pagination():
+            return self.get_keyset_page().object_list
+        ordering = self.get_ordering() if self.apply_ordering else []
+        if not isinstance(self.object_list, QuerySet):
+            if ordering:
+                return self.sort_object_list(self.object_list, ordering)
+            return self.object_list
+        if self.object_list._result_cache is not None:
+            if ordering:
+                return self.sort_object_list(self.object_list, ordering)
+            return self.object_list
+        object_list = self.object_list
+        if ordering:
+            if object_list.query.is_sliced:
+                return self.sort_object_list(object_list, ordering)
+            object_list = object_list.order_by(*ordering)
+        if self.use_values_list():
+            return object_list.values_list(*self.get_projected_fields())
+        return self.prepare_queryset(object_list)
+
+    def prepare_queryset(self, object_list: QuerySet) -> QuerySet:
+        """Fetch the related objects and apply the projection if enabled."""
+        select_related, prefetch_related = self.get_related_lookups()
+        if select_related:
+            object_list = object_list.select_related(*select_related)
+        if prefetch_related:
+            object_list = object_list.prefetch_related(*prefetch_related)
+        if self.only_displayed_fields:
+            projected_fields = self.get_projected_fields()
+            if len(projected_fields) > 0:
+                object_list = object_list.only(*projected_fields)
+        return object_list
+
+    def get_row_accessors(self) -> tuple[Callable, ...]:
+        """Return the value accessor of every column, in display order."""
+        if self.use_values_list():
+            projected_fields = self.get_projected_fields()
+            return tuple(
+                itemgetter(projected_fields.index(column.column_field))
+                if isinstance(column, TableColumn)
+                else column.get_accessor()
+                for column in self.column_names
+            )
+        return tuple(column.get_accessor() for column in self.column_names)
+
+    def get_cell_formatters(self) -> tuple[Callable, ...]:
+        """Return the function formatting the values of every column, once."""
+        if self._cell_formatters is None:
+            self._cell_formatters = tuple(
+                self.column_formatters.get(column.column_field)
+                or column.get_formatter()
+                for column in self.column_names
+            )
+        return self._cell_formatters
+
     def get_table_body(self) -> str:
         """Generate the body of the table."""
-        body_str: str = ""
-        for obj in self.object_list:
-            row_str: str = ""
-            for column in self.column_names:
-                if isinstance(column, TableColumn):
-                    row_str += f"<td>{column.get_value(obj)}</td>"
-                if isinstance(column, TableExtraColumn):
-                    row_str += f"<td>{column.get_value(obj)}</td>"
-                if isinstance(column, EmptyColumn):
-                    row_str += "<td></td>"
-            body_str += f"<tr>{row_str}</tr>"
-        return body_str
+        self._threaded_deadline = None
+        object_list = self.get_object_list()
+        if isinstance(object_list, ColumnarData):
+            return self.get_columnar_body(object_list)
+        accessors = self.get_row_accessors()
+        return "".join(
+            [
+                self.get_table_rows(batch, accessors)
+                for batch in iter_batches(object_list, self.batch_size)
+            ]
+        )
+
+    def get_columnar_body(self, data: ColumnarData) -> str:
+        """
+        Generate the body of the table for data stored by columns.
+
+        The cells are generated a column at a time, taking the values of the
+        columns in bulk, and only the added columns go through the rows.
+        """
+        if not self.column_names:
+            return "<tr></tr>" * len(data)
+        rows = None
+        columns_cells = []
+        for column, accessor, formatter in zip(
+            self.column_names, self.get_row_accessors(), self.get_cell_formatters()
+        ):
+            if (
+                type(column) is TableColumn
+                and len(column.attributes) == 1
+                and column.column_field in data.columns
+            ):
+                values = data.get_column(column.column_field)
+            elif isinstance(column, EmptyColumn):
+                values = [""] * len(data)
+            else:
+                if rows is None:
+                    rows = list(data)
+                if isinstance(column, TableBatchColumn):
+                    values = [
+                        value
+                        for batch in iter_batches(rows, self.batch_size)
+                        for value in column.get_values(batch)
+                    ]
+                elif self.is_threaded_column(column):
+                    values = [
+                        value
+                        for batch in iter_batches(rows, self.batch_size)
+                        for value in self.get_threaded_values(accessor, batch)
+                    ]
+                else:
+                    values = [accessor(row) for row in rows]
+            columns_cells.append(self.format_column(values, formatter))
+        return self.join_cells(columns_cells)
+
+    def get_rows_values(self, objects: list, accessors: tuple[Callable, ...]):
+        """
+        Return the values of every row for a batch of objects.
+
+        The values of the batch columns are computed with a single call for all
+        the objects, the values of the threaded columns in a pool of threads and
+        the rest using the accessors.
+        """
+        batch_columns = [
+            (position, column)
+            for position, column in enumerate(self.column_names)
+            if isinstance(column, TableBatchColumn) or self.is_threaded_column(column)
+        ]
+        if not batch_columns:
+            return [[accessor(obj) for accessor in accessors] for obj in objects]
+        row_accessors = list(accessors)
+        for position, _ in batch_columns:
+            row_accessors[position] = _no_value
+        rows = [[accessor(obj) for accessor in row_accessors] for obj in objects]
+        for position, column in batch_columns:
+            if isinstance(column, TableBatchColumn):
+                get_values = column.get_values
+            else:
+                get_values = partial(self.get_threaded_values, accessors[position])
+            if self._render_metrics is not None:
+                get_values = self._render_metrics.time_column(
+                    column.column_field, get_values
+                )
+            values = get_values(objects)
+            for row, value in zip(rows, values):
+                row[position] = value
+        return rows
+
+    def is_threaded_column(self, column: BaseColumn) -> bool:
+        """Check if the values of the column are computed in a pool of threads."""
+        return isinstance(column, TableExtraColumn) and (
+            column.threaded or column.column_field in self.threaded_columns
+        )
+
+    def get_threaded_values(self, accessor: Callable, objects: list) -> list:
+        """
+        Return the values of a column for the objects, computed in threads.
+
+        The values not computed before the threaded_timeout of the render are
+        replaced by the threaded_fallback. The timeout starts with the first
+        threaded values of every render, body or export. The calls are made in
+        the pool of threads of the process for the max_workers, and the ones
+        already running at the timeout keep running in the pool.
+        """
+        if self.threaded_timeout is not None and self._threaded_deadline is None:
+            self._threaded_deadline = time.monotonic() + self.threaded_timeout
+        executor = get_thread_pool(max(1, self.max_workers))
+        futures = [executor.submit(accessor, obj) for obj in objects]
+        timeout = (
+            max(0.0, self._threaded_deadline - time.monotonic())
+            if self._threaded_deadline is not None
+            else None
+        )
+        _, not_done = wait(futures, timeout=timeout)
+        for future in not_done:
+            # The calls already running can't be stopped, only the queued ones.
+            future.cancel()
+        return [
+            future.result()
+            if future.done() and not future.cancelled()
+            else self.threaded_fallback
+            for future in futures
+        ]
+
+    def get_table_rows(self, objects: list, accessors: tuple[Callable, ...]) -> str:
+        """Generate the rows of the table for a batch of objects."""
+        return self.format_rows(self.get_rows_values(objects, accessors))
+
+    def get_table_row(self, obj, accessors: tuple[Callable, ...] = None) -> str:
+        """Generate a row of the table for the given object."""
+        if accessors is None:
+            accessors = self.get_row_accessors()
+        return self.format_row([accessor(obj) for accessor in accessors])
+
+    def format_row(self, values: list) -> str:
+        """Generate a row of the table with the given values."""
+        return self.format_rows([values])
+
+    def format_rows(self, rows: list[list]) -> str:
+        """
+        Generate the rows of the table with the given values.
+
+        The values are formatted and escaped a column at a time, so the cells
+        of a column are escaped in a single pass.
+        """
+        if not rows:
+            return ""
+        if not self.column_names:
+            return "<tr></tr>" * len(rows)
+        columns_cells = [
+            self.format_column(values, formatter)
+            for values, formatter in zip(zip(*rows), self.get_cell_formatters())
+        ]
+        return self.join_cells(columns_cells)
+
+    def format_column(self, values, formatter: Callable) -> list[str]:
+        """Return the escaped text of the cells of a column."""
+        return escape_cells(list(map(formatter, values)))
+
+    def join_cells(self, columns_cells: list[list[str]]) -> str:
+        """Generate the rows of the table from the text of every column."""
+        return self.renderer.render_rows(
+            [column.column_field for column in self.column_names], columns_cells
+        )
 
     def get_table_headers(self) -> str:
         """Generate the column with the link to sort."""
         headers_str: str = ""
+        sortable_columns = (
+            self.get_sortable_columns() if self.restrict_sorting() else None
+        )
         for column in self.column_names:
-            if isinstance(column, (TableExtraColumn, EmptyColumn)):
-                headers_str += f"<th>{column.column_header}</th>"
+            if isinstance(column, (TableExtraColumn, EmptyColumn)) or (
+                sortable_columns is not None
+                and column.column_field not in sortable_columns
+            ):
+                headers_str += self.renderer.render_header(
+                    {**self.get_header_context(column), "sortable": False}
+                )
                 continue
-            field_to_sort, column_name = column.column_field, column.column_header
             sort_url, remove_sort_url, first_sort, descending = self.get_sort_url(
-                field_to_sort
+                column.column_field
             )
-            headers_str += """
-                <th class="column-sorted{table_header_clases}">
-                    <div>
-                        {column_name}
-                        <div class="sort-options {show_sort}">
-                            <a href="?{sort_url}" role="button" title="{ordering_text}">
-                                <i class="fa-solid fa-sort{sort_direction}"></i>
-                            </a>
-                        </div>
-                        <div class="sort-options">
-                            <a href="?{remove_sort_url}"
-                                class="{hide_cancel}"
-                                role="button"
-                                title="Remove sort">
-                                    <i class="fa-solid fa-ban"></i>
-                            </a>
-                        </div>
-                    </div>
-                </th>""".format(  # noqa: F522
-                remove_sort_url=remove_sort_url,
-                sort_direction=""
-                if first_sort
-                else "-up"
-                if not descending
-                else "-down",
-                field_to_sort=field_to_sort,
-                column_name=column_name,
-                ordering_text=f"Sort by {column_name}" if first_sort else "Toggle sort",
-                hide_cancel="hidden" if first_sort else "",
-                show_sort="show" if not first_sort else "",
-                sort_url=sort_url,
-                table_header_clases=column.classes(),
+            headers_str += self.renderer.render_header(
+                {
+                    **self.get_header_context(column),
+                    "sortable": True,
+                    "sort_url": sort_url,
+                    "remove_sort_url": remove_sort_url,
+                    "first_sort": first_sort,
+                    "descending": descending,
+                }
             )
         return headers_str
 
+    def get_header_context(self, column: BaseColumn) -> dict:
+        """Return the context of the header of a column for the renderer."""
+        return {
+            "column": column,
+            "column_header": column.column_header,
+            "field": column.column_field,
+            "css_classes": column.classes(),
+        }
+
+    def get_footer_values(self) -> dict:
+        """Return the value of the footer aggregates, computing them once."""
+        if self._footer_values is not None:
+            return self._footer_values
+        if not isinstance(self.object_list, QuerySet):
+            columns = {column.column_field: column for column in self.column_names}
+            self._footer_values = aggregate_objects(
+                self.get_object_list(),
+                {
+                    field: (name, columns[field].get_accessor())
+                    for field, name in self.footer_aggregates.items()
+                    if field in columns
+                },
+            )
+            return self._footer_values
+        object_list = self.object_list.all()
+        object_list.query.clear_limits()
+        aliases = {}
+        for position, (field, name) in enumerate(self.footer_aggregates.items()):
+            try:
+                resolve_lookup(self.object_list.model, field)
+            except FieldDoesNotExist as error:
+                raise ValueError(
+                    f"Cannot aggregate {field!r}, only the fields of the model "
+                    "can be aggregated in a QuerySet."
+                ) from error
+            aliases[f"footer_{position}"] = (field, AGGREGATES[name](field))
+        values = object_list.order_by().aggregate(
+            **{alias: aggregate for alias, (_, aggregate) in aliases.items()}
+        )
+        self._footer_values = {
+            field: values[alias] for alias, (field, _) in aliases.items()
+        }
+        return self._footer_values
+
+    async def aget_footer_values(self) -> dict:
+        """Return the value of the footer aggregates in an async view."""
+        return await sync_to_async(self.get_footer_values)()
+
+    def get_table_footer(self) -> str:
+        """Generate the footer of the table with the aggregates."""
+        if not self.footer_aggregates:
+            return ""
+        footer_values = self.get_footer_values()
+        cells = []
+        for column, formatter in zip(self.column_names, self.get_cell_formatters()):
+            if self.footer_aggregates.get(column.column_field) == "count":
+                formatter = format_value
+            value = footer_values.get(column.column_field)
+            cells.append(formatter(value) if value is not None else "")
+        return self.renderer.render_footer(
+            [column.column_field for column in self.column_names], escape_cells(cells)
+        )
+
     def contains_field(self, lookups: list, field: str) -> int:
         """Check if the field is in the sort lookups."""
         try:
@@ -219,45 +1529,20 @@ class TableSort:
         except ValueError:
             return -1
 
+    def get_sort_state(self) -> SortState:
+        """Return the sort lookups of the request, parsed once per table."""
+        if self._sort_state is None:
+            ignored_keys = list(self.excluded_url_lookups)
+            if self.keyset_page_size is not None:
+                ignored_keys.append(self.cursor_key_name)
+            self._sort_state = SortState(
+                self.request.GET, self.sort_key_name, ignored_keys=ignored_keys
+            )
+        return self._sort_state
+
     def get_sort_url(self, field: str) -> tuple[str, str, bool, bool]:
         """Generate the urls to sort the table for the given field."""
-        lookups = self.request.GET.copy()
-        removed_lookup = self.request.GET.copy()
-
-        first_sort = True
-        descending = True
-
-        if self.sort_key_name in lookups.keys():
-            current_order = lookups.getlist(self.sort_key_name, [])
-            removed_order = current_order.copy()
-            position = self.contains_field(current_order, field)
-            if position != -1:
-                first_sort = False
-                descending = False
-                current_order[position] = f"-{field}"
-                removed_order.remove(field)
-            else:
-                position = self.contains_field(current_order, f"-{field}")
-                if position != -1:
-                    first_sort = False
-                    current_order[position] = field
-                    removed_order.remove(f"-{field}")
-                else:
-                    current_order.append(field)
-            lookups.setlist(self.sort_key_name, current_order)
-            if len(removed_order) >= 1:
-                removed_lookup.setlist(self.sort_key_name, removed_order)
-            else:
-                removed_lookup.pop(self.sort_key_name)
-        else:
-            lookups.setlist(self.sort_key_name, [field])
-
-        return (
-            lookups.urlencode(),
-            removed_lookup.urlencode(),
-            first_sort,
-            descending,
-        )
+        return self.get_sort_state().get_sort_url(field)
 
     def sort_columns(self, field_order: list):
         """Sort the columns according to the field order."""
@@ -273,11 +1558,135 @@ class TableSort:
             for field in field_order
         ]
 
+        priorities = {}
+        for position, field in enumerate(field_order):
+            priorities.setdefault(field, position)
+
         def _get_field_priority(field: str) -> int:
             """Get the priority of the field."""
-            try:
-                return field_order.index(field)
-            except ValueError:
-                return sys.maxsize
+            return priorities.get(field, sys.maxsize)
 
         self.column_names.sort(key=lambda item: _get_field_priority(item.column_field))
+
+
+class Table(TableSort):
+    """
+    Base class to declare a table with its options in a ``Meta`` class.
+
+    The columns of the table are created the first time it's used and reused
+    in the next instances, so only the request and the objects are bound to
+    each instance.
+
+    .. code-block:: python
+
+        class PersonTable(Table):
+            class Meta:
+                model = Person
+                fields = ["name", "age"]
+                field_order = ["age"]
+
+
+        PersonTable(request)
+
+    :param request: current ``HttpRequest`` to get the url lookups to create the links.
+    :param object_list: ``QuerySet`` or ``list`` to fill the table, the default
+        value is all the objects of the ``Meta.model``.
+    :param kwargs: Any parameter accepted by :class:`TableSort`, overriding the
+        options declared in the ``Meta`` class. The columns are created again
+        if a parameter used to create them is provided.
+    """
+
+    COLUMN_OPTIONS = (
+        "fields",
+        "exclude",
+        "column_names",
+        "field_order",
+        "show_primary_key",
+        "added_columns",
+        "batch_added_columns",
+        "column_headers_css_classes",
+    )
+
+    class Meta:
+        pass
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cache_alias = getattr(cls.Meta, "cache_alias", None)
+        if cache_alias is not None and getattr(cls.Meta, "model", None) is not None:
+            watch_models(cls.get_declared_cache_models(), cache_alias)
+
+    @classmethod
+    def get_declared_cache_models(cls) -> list:
+        """
+        Return the models whose changes invalidate the cached tables of the class.
+
+        They are registered when the class is declared, so the tables are
+        invalidated by the processes that save the objects even if they never
+        rendered the table.
+        """
+        model = cls.Meta.model
+        fields = getattr(cls.Meta, "fields", ALL_FIELDS)
+        if fields is None or fields == ALL_FIELDS or hasattr(cls.Meta, "exclude"):
+            lookups = [
+                field.name for field in model._meta.get_fields() if field.is_relation
+            ]
+        else:
+            lookups = list(fields)
+        models = [model]
+        for lookup in lookups:
+            try:
+                related_fields = resolve_lookup(model, lookup)
+            except FieldDoesNotExist:
+                continue
+            for field in related_fields:
+                if field.is_relation and field.related_model not in models:
+                    models.append(field.related_model)
+        return models
+
+    def __init__(
+        self,
+        request: HttpRequest,
+        object_list: None | QuerySet | list = None,
+        **kwargs,
+    ):
+        options = {
+            name: value
+            for name, value in vars(self.Meta).items()
+            if not name.startswith("_") and name != "model"
+        }
+        self._use_cached_columns = not any(
+            option in kwargs for option in self.COLUMN_OPTIONS
+        )
+        options.update(kwargs)
+        if object_list is None:
+            object_list = self.Meta.model._default_manager.all()
+        super().__init__(request, object_list, **options)
+
+    def get_columns(
+        self,
+        fields: None | list,
+        exclude: None | list,
+        column_names: None | dict[str, str],
+        field_order: None | list[str],
+    ) -> list[BaseColumn]:
+        """
+        Create the columns of the table, reusing the ones of the class.
+
+        The columns are only cached for a ``QuerySet`` of the ``Meta.model``,
+        other objects always create their own columns.
+        """
+        if not self._use_cached_columns or not self.uses_model_queryset():
+            return super().get_columns(fields, exclude, column_names, field_order)
+        cls = type(self)
+        if "_columns" not in cls.__dict__:
+            cls._columns = tuple(
+                super().get_columns(fields, exclude, column_names, field_order)
+            )
+        return list(cls._columns)
+
+    def uses_model_queryset(self) -> bool:
+        """Check if the objects of the table are a ``QuerySet`` of the model."""
+        return isinstance(self.object_list, QuerySet) and self.object_list.model is (
+            getattr(self.Meta, "model", None)
+        )
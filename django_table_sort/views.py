@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from django.http import HttpResponse
+from django.http import HttpResponseBadRequest
+
+from django_table_sort.table import TableSort
+
+TABLE_PARTS = ("headers", "body", "rows")
+
+
+class TableSortMixin:
+    """
+    Mixin for class based views displaying a table.
+
+    The table is added to the context as ``table``, and a request with the
+    ``table_part`` lookup returns only a part of the table instead of the whole
+    page, so the table can be updated by the client:
+
+    * ``?table_part=headers`` returns the ``<thead>`` of the table.
+    * ``?table_part=body`` returns the ``<tbody>`` of the table.
+    * ``?table_part=rows&start=50&stop=100`` returns the rows between ``start``
+      and ``stop``.
+
+    The sort lookups in the url are applied to every part.
+    """
+
+    table_class: type[TableSort] = None
+    table_context_name = "table"
+    partial_key_name = "table_part"
+    rows_start_key_name = "start"
+    rows_stop_key_name = "stop"
+
+    def get_table_data(self):
+        """Return the objects displayed in the table."""
+        if hasattr(self, "get_queryset"):
+            return self.get_queryset()
+        return None
+
+    def get_table_kwargs(self) -> dict:
+        """Return the keyword arguments to create the table."""
+        return {
+            "apply_ordering": True,
+            "excluded_url_lookups": [
+                self.partial_key_name,
+                self.rows_start_key_name,
+                self.rows_stop_key_name,
+            ],
+        }
+
+    def get_table(self) -> TableSort:
+        """Create the table for the current request."""
+        return self.table_class(
+            self.request, self.get_table_data(), **self.get_table_kwargs()
+        )
+
+    def get(self, request, *args, **kwargs):
+        part = request.GET.get(self.partial_key_name)
+        if part is not None:
+            return self.render_table_part(part)
+        return super().get(request, *args, **kwargs)
+
+    def render_table_part(self, part: str) -> HttpResponse:
+        """Return a response with the part of the table."""
+        if part not in TABLE_PARTS:
+            return HttpResponseBadRequest(f"Unknown table part {part!r}.")
+        table = self.get_table()
+        if part == "headers":
+            return HttpResponse(table.render_headers())
+        if part == "body":
+            return HttpResponse(table.render_body())
+        try:
+            start = int(self.request.GET.get(self.rows_start_key_name, 0))
+            stop = self.request.GET.get(self.rows_stop_key_name)
+            stop = int(stop) if stop is not None else None
+        except ValueError:
+            return HttpResponseBadRequest("The rows start and stop should be numbers.")
+        if start < 0 or (stop is not None and stop < start):
+            return HttpResponseBadRequest("Invalid range of rows.")
+        return HttpResponse(table.render_rows(start, stop))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context[self.table_context_name] = self.get_table()
+        return context
@@ -4,3 +4,25 @@ from django.db import models
 class Person(models.Model):
     name = models.CharField(max_length=100, verbose_name="Full Name")
     age = models.IntegerField(verbose_name="Age in years")
+
+    def __str__(self):
+        return self.name
+
+
+class Publisher(models.Model):
+    name = models.CharField(max_length=100)
+
+    def __str__(self):
+        return self.name
+
+
+class Book(models.Model):
+    title = models.CharField(max_length=100)
+    author = models.ForeignKey(Person, on_delete=models.CASCADE, related_name="+")
+    publisher = models.ForeignKey(
+        Publisher, on_delete=models.CASCADE, null=True, related_name="books"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.title
@@ -1,9 +1,58 @@
+import datetime
+import threading
+import time
+from decimal import Decimal
+from functools import partial
+from io import StringIO
+from operator import attrgetter
+from unittest import mock
+from unittest import skipUnless
+
+import django
+from django.core.management import call_command
+from django.core.management import CommandError
+from django.db import models
+from django.db.models import Avg
+from django.db.models import Count
+from django.http import HttpResponse
+from django.test import override_settings
 from django.test import RequestFactory
 from django.test import TestCase
+from django.utils.html import format_html
+from django.views.generic import TemplateView
 
+from django_table_sort.cache import cache_stats
+from django_table_sort.cache import get_invalidated_aliases
+from django_table_sort.cache import get_model_versions
+from django_table_sort.columnar import ColumnarData
 from django_table_sort.columns import EMPTY_COLUMN
+from django_table_sort.counting import CachedCount
+from django_table_sort.counting import CappedCount
+from django_table_sort.counting import EstimatedCount
+from django_table_sort.counting import TableCount
+from django_table_sort.decorators import table_condition
+from django_table_sort.formatters import get_field_formatter
+from django_table_sort.memo import memoize
+from django_table_sort.pagination import encode_cursor
+from django_table_sort.renderers import StringRenderer
+from django_table_sort.renderers import TemplateRenderer
+from django_table_sort.signals import table_rendered
+from django_table_sort.table import Table
 from django_table_sort.table import TableSort
+from django_table_sort.views import TableSortMixin
+from tests.models import Book
 from tests.models import Person
+from tests.models import Publisher
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
 
 
 class Test(TestCase):
@@ -208,3 +257,1143 @@ class Test(TestCase):
         )
         result = table.render()
         self.assertIn("filed1-header-class", result)
+
+    def test_table_stream(self):
+        Person.objects.create(name="Jane Doe", age=31)
+        table = TableSort(
+            request=self.request,
+            object_list=Person.objects.all(),
+            table_id="people",
+        )
+        chunks = list(table.stream(chunk_size=1))
+        self.assertEqual(len(chunks), 4)
+        self.assertIn('<table id="people"', chunks[0])
+        self.assertIn("?o=name", chunks[0])
+        self.assertIn(self.person.name, chunks[1])
+        self.assertIn("Jane Doe", chunks[2])
+        self.assertIn("</table>", chunks[3])
+        self.assertEqual("".join(chunks), table.render())
+
+    def test_table_row_accessors(self):
+        table = TableSort(
+            request=self.request,
+            object_list=Person.objects.all(),
+            column_names={"name": "Name", "EMPTY-COLUMN-1": "Empty"},
+            fields=None,
+            added_columns=[(("next_age", "Next Age"), lambda obj: obj.age + 1)],
+        )
+        accessors = table.get_row_accessors()
+        self.assertEqual(len(accessors), 3)
+        self.assertEqual(
+            [accessor(self.person) for accessor in accessors], ["John Doe", "", 24]
+        )
+        self.assertEqual(
+            table.get_table_body(), "<tr><td>John Doe</td><td></td><td>24</td></tr>"
+        )
+
+    def test_table_only_displayed_fields(self):
+        table = TableSort(
+            request=self.request,
+            object_list=Person.objects.all(),
+            fields=["name"],
+            only_displayed_fields=True,
+        )
+        self.assertTrue(table.use_values_list())
+        self.assertEqual(list(table.get_object_list()), [(self.person.name,)])
+        self.assertEqual(table.get_table_body(), "<tr><td>John Doe</td></tr>")
+        table = TableSort(
+            request=self.request,
+            object_list=Person.objects.all(),
+            fields=["name"],
+            added_columns=[(("next_age", "Next Age"), lambda obj: obj.age + 1)],
+            only_displayed_fields=True,
+        )
+        self.assertFalse(table.use_values_list())
+        person = table.get_object_list().get()
+        self.assertEqual(person.get_deferred_fields(), {"age"})
+        self.assertIn("<td>John Doe</td><td>24</td>", table.render())
+
+    def test_table_related_columns(self):
+        publisher = Publisher.objects.create(name="ACME")
+        for title in ("Book 1", "Book 2"):
+            Book.objects.create(title=title, author=self.person, publisher=publisher)
+        table = TableSort(
+            request=self.request,
+            object_list=Book.objects.all(),
+            fields=["title", "author", "publisher__name"],
+        )
+        table_columns = [
+            (column.column_field, column.column_header) for column in table.column_names
+        ]
+        self.assertIn(("publisher__name", "Name"), table_columns)
+        self.assertEqual(table.get_related_lookups(), (["author", "publisher"], []))
+        with self.assertNumQueries(1):
+            body = table.get_table_body()
+        self.assertIn("<td>Book 1</td><td>John Doe</td><td>ACME</td>", body)
+
+    def test_table_many_valued_columns(self):
+        publisher = Publisher.objects.create(name="ACME")
+        for title in ("Book 1", "Book 2"):
+            Book.objects.create(title=title, author=self.person, publisher=publisher)
+        table = TableSort(
+            request=self.request,
+            object_list=Publisher.objects.all(),
+            fields=["name", "books"],
+        )
+        table_columns = [
+            (column.column_field, column.column_header) for column in table.column_names
+        ]
+        self.assertIn(("books", "Books"), table_columns)
+        self.assertEqual(table.get_related_lookups(), ([], ["books"]))
+        with self.assertNumQueries(2):
+            body = table.get_table_body()
+        self.assertIn("<td>Book 1, Book 2</td><td>ACME</td>", body)
+
+    def test_table_many_valued_lookup_columns(self):
+        publisher = Publisher.objects.create(name="ACME")
+        for title in ("Book 1", "Book 2"):
+            Book.objects.create(title=title, author=self.person, publisher=publisher)
+        table = TableSort(
+            request=self.request,
+            object_list=Publisher.objects.all(),
+            fields=["name", "books__title", "books__author__name"],
+        )
+        self.assertEqual(table.get_related_lookups(), ([], ["books", "books__author"]))
+        with self.assertNumQueries(3):
+            body = table.get_table_body()
+        self.assertIn(
+            "<td>ACME</td><td>Book 1, Book 2</td><td>John Doe, John Doe</td>", body
+        )
+
+    def test_table_apply_ordering(self):
+        Person.objects.create(name="Jane Doe", age=31)
+        Person.objects.create(name="Alice", age=23)
+        table = TableSort(
+            request=self.request_factory.get("?o=age&o=-name&o=id"),
+            object_list=Person.objects.all(),
+            apply_ordering=True,
+        )
+        self.assertEqual(table.get_ordering(), ["age", "-name"])
+        self.assertEqual(
+            [person.name for person in table.get_object_list()],
+            ["John Doe", "Alice", "Jane Doe"],
+        )
+        table = TableSort(
+            request=self.request_factory.get("?o=age&o=-name&o=id"),
+            object_list=list(Person.objects.order_by("-age", "name")),
+            fields=None,
+            column_names={"name": "Name", "age": "Age"},
+            apply_ordering=True,
+        )
+        self.assertEqual(
+            [person.name for person in table.get_object_list()],
+            ["John Doe", "Alice", "Jane Doe"],
+        )
+        people = [
+            Person(name=name, age=age)
+            for name, age in (("A", None), ("B", 23), ("C", None), ("D", 31))
+        ]
+        for query_string, names in (
+            ("?o=age", ["B", "D", "A", "C"]),
+            ("?o=-age", ["D", "B", "A", "C"]),
+            ("?o=-age&o=-name", ["D", "B", "C", "A"]),
+        ):
+            table = TableSort(
+                request=self.request_factory.get(query_string),
+                object_list=people,
+                column_names={"name": "Name", "age": "Age"},
+                apply_ordering=True,
+            )
+            self.assertEqual([person.name for person in table.get_object_list()], names)
+
+    def test_table_apply_ordering_relations(self):
+        jane = Person.objects.create(name="Jane Doe", age=31)
+        books = [
+            Book.objects.create(title=title, author=author)
+            for title, author in (("A", jane), ("B", self.person), ("C", jane))
+        ]
+        for query_string, titles in (
+            ("?o=author&o=title", ["B", "A", "C"]),
+            ("?o=-author&o=title", ["A", "C", "B"]),
+        ):
+            table = TableSort(
+                request=self.request_factory.get(query_string),
+                object_list=books,
+                column_names={"title": "Title", "author": "Author"},
+                apply_ordering=True,
+            )
+            self.assertIn("Author", table.render())
+            self.assertEqual([book.title for book in table.get_object_list()], titles)
+
+    def test_table_keyset_pagination(self):
+        for name, age in (("Jane Doe", 31), ("Alice", 23), ("Bob", 40), ("Carl", 18)):
+            Person.objects.create(name=name, age=age)
+
+        def get_table(query_string):
+            return TableSort(
+                request=self.request_factory.get(query_string),
+                object_list=Person.objects.all(),
+                keyset_page_size=2,
+            )
+
+        table = get_table("?o=-age")
+        self.assertEqual(
+            [person.name for person in table.get_object_list()], ["Bob", "Jane Doe"]
+        )
+        self.assertIsNone(table.get_previous_page_url())
+        self.assertNotIn('rel="prev"', table.render())
+        table = get_table(f"?{table.get_next_page_url()}")
+        self.assertEqual(
+            [person.name for person in table.get_object_list()], ["John Doe", "Alice"]
+        )
+        self.assertIn("?o=-age&o=name", table.render())
+        self.assertNotIn("cursor", table.get_sort_url("name")[0])
+        next_table = get_table(f"?{table.get_next_page_url()}")
+        self.assertEqual(
+            [person.name for person in next_table.get_object_list()], ["Carl"]
+        )
+        self.assertIsNone(next_table.get_next_page_url())
+        previous_table = get_table(f"?{next_table.get_previous_page_url()}")
+        self.assertEqual(
+            [person.name for person in previous_table.get_object_list()],
+            ["John Doe", "Alice"],
+        )
+        previous_table = get_table(f"?{previous_table.get_previous_page_url()}")
+        self.assertEqual(
+            [person.name for person in previous_table.get_object_list()],
+            ["Bob", "Jane Doe"],
+        )
+        self.assertIsNone(previous_table.get_previous_page_url())
+        self.assertIsNotNone(previous_table.get_next_page_url())
+
+        cursor = encode_cursor(["abc", 1])
+        table = get_table(f"?o=age&cursor={cursor}")
+        self.assertEqual(
+            [person.name for person in table.get_object_list()], ["Carl", "John Doe"]
+        )
+        self.assertIsNone(table.get_previous_page_url())
+        table = get_table(f"?o=age&cursor={encode_cursor([23])}")
+        self.assertEqual(len(table.get_object_list()), 2)
+
+    def test_table_keyset_pagination_nulls(self):
+        publishers = [Publisher.objects.create(name=name) for name in "BA"]
+        for title, publisher in (
+            ("One", publishers[0]),
+            ("Two", None),
+            ("Three", publishers[1]),
+            ("Four", None),
+        ):
+            Book.objects.create(title=title, author=self.person, publisher=publisher)
+
+        for query_string, expected in (
+            ("?o=publisher", ["One", "Three", "Two", "Four"]),
+            ("?o=-publisher", ["Three", "One", "Two", "Four"]),
+        ):
+            titles = []
+            tables = []
+            url = query_string
+            while url is not None:
+                table = TableSort(
+                    request=self.request_factory.get(url),
+                    object_list=Book.objects.all(),
+                    fields=["title", "publisher"],
+                    keyset_page_size=1,
+                )
+                titles += [book.title for book in table.get_object_list()]
+                tables.append(table)
+                next_url = table.get_next_page_url()
+                url = f"?{next_url}" if next_url else None
+            self.assertEqual(titles, expected)
+            titles = []
+            table = tables[-1]
+            while table is not None:
+                titles += [book.title for book in table.get_object_list()]
+                previous_url = table.get_previous_page_url()
+                table = (
+                    TableSort(
+                        request=self.request_factory.get(f"?{previous_url}"),
+                        object_list=Book.objects.all(),
+                        fields=["title", "publisher"],
+                        keyset_page_size=1,
+                    )
+                    if previous_url
+                    else None
+                )
+            self.assertEqual(titles, expected[::-1])
+
+    def test_table_keyset_pagination_microseconds(self):
+        updated_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        for number in range(5):
+            book = Book.objects.create(title=f"b{number}", author=self.person)
+            Book.objects.filter(pk=book.pk).update(
+                updated_at=updated_at + datetime.timedelta(microseconds=number * 100)
+            )
+        titles = []
+        url = "?o=updated_at"
+        while url is not None and len(titles) < 10:
+            table = TableSort(
+                request=self.request_factory.get(url),
+                object_list=Book.objects.all(),
+                fields=["title", "updated_at"],
+                keyset_page_size=2,
+            )
+            titles += [book.title for book in table.get_object_list()]
+            next_url = table.get_next_page_url()
+            url = f"?{next_url}" if next_url else None
+        self.assertEqual(titles, ["b0", "b1", "b2", "b3", "b4"])
+
+    def test_table_sort_state(self):
+        table = TableSort(
+            request=self.request_factory.get("?o=name&page=2&o=-age&q=a+b"),
+            object_list=Person.objects.all(),
+        )
+        self.assertEqual(
+            table.get_sort_url("name"),
+            ("o=-name&o=-age&page=2&q=a+b", "o=-age&page=2&q=a+b", False, False),
+        )
+        self.assertEqual(
+            table.get_sort_url("age"),
+            ("o=name&o=age&page=2&q=a+b", "o=name&page=2&q=a+b", False, True),
+        )
+        self.assertEqual(
+            table.get_sort_url("id"),
+            (
+                "o=name&o=-age&o=id&page=2&q=a+b",
+                "o=name&o=-age&page=2&q=a+b",
+                True,
+                True,
+            ),
+        )
+        self.assertIs(table.get_sort_state(), table.get_sort_state())
+
+    def test_declarative_table(self):
+        class PersonTable(Table):
+            class Meta:
+                model = Person
+                fields = ["name", "age"]
+                field_order = ["age"]
+                column_names = {"age": "Age"}
+                table_id = "people"
+
+        table = PersonTable(self.request)
+        table_columns = [
+            (column.column_field, column.column_header) for column in table.column_names
+        ]
+        self.assertEqual(table_columns, [("age", "Age"), ("name", "Full Name")])
+        self.assertIn('<table id="people"', table.render())
+        self.assertIn(self.person.name, table.render())
+        other_table = PersonTable(
+            self.request_factory.get("?o=age"), Person.objects.filter(age__gt=50)
+        )
+        self.assertEqual(other_table.column_names, table.column_names)
+        self.assertIsNot(other_table.column_names, table.column_names)
+        self.assertIs(other_table.column_names[0], table.column_names[0])
+        self.assertNotIn(self.person.name, other_table.render())
+        custom_table = PersonTable(self.request, fields=["name"])
+        self.assertEqual(len(custom_table.column_names), 1)
+        self.assertEqual(len(PersonTable(self.request).column_names), 2)
+
+    def test_declarative_table_list_first(self):
+        class PersonTable(Table):
+            class Meta:
+                model = Person
+                fields = ["name", "age"]
+
+        list_table = PersonTable(self.request, [])
+        self.assertEqual(list_table.column_names, [])
+        table = PersonTable(self.request)
+        self.assertEqual(
+            [column.column_field for column in table.column_names], ["name", "age"]
+        )
+        self.assertIn(self.person.name, table.render())
+        self.assertEqual(PersonTable(self.request, []).column_names, [])
+
+    def test_table_cache(self):
+        cache_stats.reset()
+
+        def render_table(query_string=""):
+            return TableSort(
+                request=self.request_factory.get(query_string),
+                object_list=Book.objects.all(),
+                fields=["title", "author"],
+                cache_alias="default",
+            ).render()
+
+        Book.objects.create(title="Book 1", author=self.person)
+        result = render_table()
+        self.assertIn("John Doe", result)
+        with self.assertNumQueries(0):
+            self.assertEqual(render_table(), result)
+        self.assertEqual((cache_stats.hits, cache_stats.misses), (1, 1))
+        render_table("?o=title")
+        self.assertEqual((cache_stats.hits, cache_stats.misses), (1, 2))
+        self.person.name = "Johnny Doe"
+        self.person.save()
+        self.assertIn("Johnny Doe", render_table())
+        Book.objects.create(title="Book 2", author=self.person)
+        self.assertIn("Book 2", render_table())
+        self.assertEqual((cache_stats.hits, cache_stats.misses), (1, 4))
+        self.assertEqual(cache_stats.hit_rate, 0.2)
+
+    def test_table_cache_callable_columns(self):
+        class Label:
+            def __call__(self, person):
+                return f"Person {person.pk}"
+
+        def add(person, number):
+            return person.age + number
+
+        def render_table(number):
+            return TableSort(
+                request=self.request,
+                object_list=Person.objects.all(),
+                added_columns=[
+                    (("plus", "Plus"), partial(add, number=number)),
+                    (("label", "Label"), Label()),
+                ],
+                cache_alias="default",
+            ).render()
+
+        self.assertIn("<td>24</td>", render_table(1))
+        self.assertIn("<td>25</td>", render_table(2))
+
+    def test_table_cache_invalidated_without_render(self):
+        class BookTable(Table):
+            class Meta:
+                model = Book
+                fields = ["title", "author__name"]
+                cache_alias = "default"
+
+        self.assertEqual(BookTable.get_declared_cache_models(), [Book, Person])
+        self.assertEqual(get_invalidated_aliases(Person), {"default"})
+        [version] = get_model_versions([Publisher], "default")
+        with override_settings(TABLE_SORT_CACHE_ALIASES=["default"]):
+            self.assertEqual(get_invalidated_aliases(Publisher), {"default"})
+            Publisher.objects.create(name="Publisher")
+        self.assertNotEqual(get_model_versions([Publisher], "default"), [version])
+
+    @skipUnless(django.VERSION >= (4, 1), "the async QuerySet requires Django 4.1")
+    async def test_table_arender(self):
+        await Person.objects.acreate(name="Jane Doe", age=31)
+
+        async def next_age(person):
+            return person.age + 1
+
+        table = TableSort(
+            request=self.request,
+            object_list=Person.objects.all(),
+            added_columns=[(("next_age", "Next Age"), next_age)],
+        )
+        chunks = [chunk async for chunk in table.astream(chunk_size=1)]
+        self.assertEqual(len(chunks), 4)
+        self.assertIn("<td>John Doe</td><td>23</td><td>24</td>", chunks[1])
+        self.assertIn("<td>Jane Doe</td><td>31</td><td>32</td>", chunks[2])
+        self.assertEqual(await table.arender(), "".join(chunks))
+        table = TableSort(
+            request=self.request_factory.get("?o=-age"),
+            object_list=Person.objects.all(),
+            keyset_page_size=1,
+        )
+        result = await table.arender()
+        self.assertIn("Jane Doe", result)
+        self.assertNotIn("John Doe", result)
+        self.assertIn('rel="next"', result)
+        table = TableSort(
+            request=self.request,
+            object_list=Person.objects.all(),
+            footer_aggregates={"age": "sum"},
+        )
+        self.assertIn("<td></td><td>54</td>", await table.arender())
+        table = TableSort(
+            request=self.request_factory.get("?o=-age"),
+            object_list=Person.objects.all(),
+            keyset_page_size=1,
+            sort_index_threshold=1,
+        )
+        result = await table.arender()
+        self.assertIn("<th>Age In Years</th>", result)
+        self.assertIn("John Doe", result)
+
+    @skipUnless(django.VERSION >= (4, 1), "the async QuerySet requires Django 4.1")
+    async def test_table_arender_sliced(self):
+        for title in ("A", "C", "B", "D"):
+            await Book.objects.acreate(title=title, author=self.person)
+        table = TableSort(
+            request=self.request_factory.get("?o=-title"),
+            object_list=Book.objects.order_by("pk")[:3],
+            fields=["title", "author"],
+            apply_ordering=True,
+        )
+        result = await table.arender()
+        self.assertIn(
+            "<tr><td>C</td><td>John Doe</td></tr>"
+            "<tr><td>B</td><td>John Doe</td></tr>"
+            "<tr><td>A</td><td>John Doe</td></tr>",
+            result,
+        )
+        self.assertNotIn("<td>D</td>", result)
+
+    async def test_table_arender_django_version(self):
+        table = TableSort(request=self.request, object_list=Person.objects.all())
+        with mock.patch("django.VERSION", (4, 0, 0, "final", 0)):
+            with self.assertRaisesMessage(RuntimeError, "Django 4.1 or later"):
+                await table.arender()
+
+    def test_table_export(self):
+        Person.objects.create(name="Doe, Jane", age=31)
+        table = TableSort(
+            request=self.request_factory.get("?o=-age"),
+            object_list=Person.objects.all(),
+            added_columns=[(("next_age", "Next Age"), lambda obj: obj.age + 1)],
+            apply_ordering=True,
+        )
+        self.assertEqual(
+            "".join(table.export(chunk_size=1)),
+            "Full Name,Age In Years,Next Age\r\n"
+            '"Doe, Jane",31,32\r\n'
+            "John Doe,23,24\r\n",
+        )
+        self.assertEqual(
+            "".join(table.export("jsonl")),
+            '{"name": "Doe, Jane", "age": 31, "next_age": 32}\n'
+            '{"name": "John Doe", "age": 23, "next_age": 24}\n',
+        )
+        with self.assertRaises(ValueError):
+            table.export("pdf")
+        table = TableSort(
+            request=self.request,
+            object_list=Person.objects.all(),
+            keyset_page_size=1,
+        )
+        self.assertEqual(len(list(table.export("jsonl"))), 1)
+        self.assertEqual(len("".join(table.export("jsonl")).splitlines()), 2)
+
+        async def next_age(person):
+            return person.age + 1
+
+        table = TableSort(
+            request=self.request,
+            object_list=Person.objects.all(),
+            added_columns=[(("next_age", "Next Age"), next_age)],
+        )
+        with self.assertRaisesMessage(ValueError, "next_age are async"):
+            table.export()
+
+    @skipUnless(xlsxwriter, "xlsxwriter is not installed")
+    def test_table_export_xlsx(self):
+        table = TableSort(request=self.request, object_list=Person.objects.all())
+        result = b"".join(table.export("xlsx"))
+        self.assertTrue(result.startswith(b"PK"))
+
+    def test_table_instrumentation(self):
+        Book.objects.create(title="Book 1", author=self.person)
+        results = []
+
+        def receiver(sender, table, metrics, **kwargs):
+            results.append(("signal", metrics))
+
+        table_rendered.connect(receiver)
+        self.addCleanup(table_rendered.disconnect, receiver)
+        table = TableSort(
+            request=self.request,
+            object_list=Book.objects.all(),
+            fields=["title"],
+            added_columns=[
+                (("author_age", "Author Age"), lambda book: book.author.age),
+            ],
+            instrumentation_callback=lambda table, metrics: results.append(
+                ("callback", metrics)
+            ),
+        )
+        result = table.render()
+        self.assertIn("<td>Book 1</td><td>23</td>", result)
+        self.assertEqual(
+            results, [("signal", table.metrics), ("callback", table.metrics)]
+        )
+        self.assertEqual(table.metrics.queries, 2)
+        self.assertEqual(list(table.metrics.column_times), ["author_age"])
+        self.assertEqual(
+            set(table.metrics.as_dict()["phases"]),
+            {"columns", "fetch", "body", "headers", "template"},
+        )
+        table = TableSort(request=self.request, object_list=Book.objects.all())
+        table.render()
+        self.assertIsNone(table.metrics)
+        self.assertEqual(len(results), 2)
+
+    def test_table_batch_added_columns(self):
+        for name, age in (("Jane Doe", 31), ("Alice", 40)):
+            Person.objects.create(name=name, age=age)
+        batches = []
+
+        def book_count(people):
+            batches.append(len(people))
+            counts = (
+                Book.objects.filter(author__in=people)
+                .values("author")
+                .annotate(count=Count("pk"))
+            )
+            return {row["author"]: row["count"] for row in counts}
+
+        def older(people):
+            return [person.age > 30 for person in people]
+
+        Book.objects.create(title="Book 1", author=self.person)
+        table = TableSort(
+            request=self.request,
+            object_list=Person.objects.order_by("pk"),
+            fields=["name"],
+            batch_added_columns=[
+                (("books", "Books"), book_count),
+                (("older", "Older"), older),
+            ],
+            batch_size=2,
+        )
+        with self.assertNumQueries(3):
+            body = table.get_table_body()
+        self.assertEqual(batches, [2, 1])
+        self.assertEqual(
+            body,
+            "<tr><td>John Doe</td><td>1</td><td>False</td></tr>"
+            "<tr><td>Jane Doe</td><td></td><td>True</td></tr>"
+            "<tr><td>Alice</td><td></td><td>True</td></tr>",
+        )
+        self.assertEqual("".join(table.stream(chunk_size=2)), table.render())
+        self.assertEqual(
+            table.get_table_row(self.person), body.split("</tr>")[0] + "</tr>"
+        )
+
+        def slow_older(people):
+            time.sleep(0.01)
+            return older(people)
+
+        table = TableSort(
+            request=self.request,
+            object_list=Person.objects.all(),
+            fields=["name"],
+            batch_added_columns=[(("older", "Older"), slow_older)],
+            instrument=True,
+        )
+        table.render()
+        self.assertGreaterEqual(table.metrics.column_times["older"], 0.01)
+        table = TableSort(
+            request=self.request,
+            object_list=Person.objects.all(),
+            fields=["name"],
+            batch_added_columns=[(("older", "Older"), lambda people: [True])],
+        )
+        with self.assertRaisesMessage(ValueError, "returned 1 values for 3 objects"):
+            table.get_table_body()
+
+    def test_table_footer_aggregates(self):
+        Person.objects.create(name="Jane Doe", age=31)
+        table = TableSort(
+            request=self.request,
+            object_list=Person.objects.order_by("pk")[:1],
+            footer_aggregates={"name": Count, "age": "sum"},
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(table.get_footer_values(), {"name": 2, "age": 54})
+        result = table.render()
+        self.assertIn("<tfoot>", result)
+        self.assertIn("<td>2</td><td>54</td>", result)
+        table = TableSort(
+            request=self.request,
+            object_list=list(Person.objects.all()),
+            fields=None,
+            column_names={"name": "Name", "age": "Age"},
+            footer_aggregates={"age": Avg},
+        )
+        self.assertIn("<td></td><td>27.0</td>", table.render())
+        Person.objects.create(name="<b>changed</b>", age=40)
+        for renderer in (StringRenderer(), TemplateRenderer()):
+            table = TableSort(
+                request=self.request,
+                object_list=Person.objects.all(),
+                footer_aggregates={"name": "min", "age": "count"},
+                renderer=renderer,
+            )
+            self.assertEqual(
+                table.get_table_footer(),
+                "<td>&lt;b&gt;changed&lt;/b&gt;</td><td>3</td>",
+            )
+        table = TableSort(request=self.request, object_list=Person.objects.all())
+        self.assertNotIn("<tfoot>", table.render())
+        with self.assertRaises(ValueError):
+            TableSort(
+                request=self.request,
+                object_list=Person.objects.all(),
+                footer_aggregates={"age": "median"},
+            )
+
+    def test_table_columnar_data(self):
+        data = {"name": ["John Doe", "Jane Doe", "Alice"], "age": [23, 31, 23]}
+        table = TableSort(
+            request=self.request_factory.get("?o=age&o=-name"),
+            object_list=data,
+            added_columns=[(("next_age", "Next Age"), lambda row: row.age + 1)],
+            apply_ordering=True,
+        )
+        self.assertIsInstance(table.object_list, ColumnarData)
+        table_columns = [
+            (column.column_field, column.column_header) for column in table.column_names
+        ]
+        self.assertEqual(
+            table_columns,
+            [("name", "Name"), ("age", "Age"), ("next_age", "Next Age")],
+        )
+        self.assertEqual(
+            table.get_table_body(),
+            "<tr><td>John Doe</td><td>23</td><td>24</td></tr>"
+            "<tr><td>Alice</td><td>23</td><td>24</td></tr>"
+            "<tr><td>Jane Doe</td><td>31</td><td>32</td></tr>",
+        )
+        self.assertEqual("".join(table.stream()), table.render())
+        rows = ColumnarData.from_rows(zip(data["name"], data["age"]), ["name", "age"])
+        self.assertEqual(
+            rows._python_sort_index(["age", "-name"]),
+            list(table.get_object_list().index),
+        )
+
+    @skipUnless(numpy, "numpy is not installed")
+    def test_table_columnar_numpy(self):
+        data = ColumnarData(
+            {
+                "name": numpy.array(["John Doe", "Jane Doe", "Alice"]),
+                "age": numpy.array([23, 31, 23]),
+            }
+        )
+        self.assertEqual(
+            data.sort(["-age", "name"]).get_column("name"),
+            ["Jane Doe", "Alice", "John Doe"],
+        )
+        self.assertEqual(data.sort(["-age", "name"]).get_column("age"), [31, 23, 23])
+
+    def test_table_columnar_nulls(self):
+        columns = {"name": ["A", "B", "C", "D"], "age": [23, None, 31, None]}
+        data = ColumnarData(columns)
+        self.assertEqual(data._python_sort_index(["age"]), [0, 2, 1, 3])
+        self.assertEqual(data._python_sort_index(["-age", "-name"]), [2, 0, 3, 1])
+        if numpy is not None:
+            self.assertEqual(data._numpy_sort_index(["age"]).tolist(), [0, 2, 1, 3])
+            self.assertEqual(
+                data._numpy_sort_index(["-age", "-name"]).tolist(), [2, 0, 3, 1]
+            )
+        table = TableSort(
+            self.request_factory.get("?o=-age"), columns, apply_ordering=True
+        )
+        self.assertEqual(
+            table.get_table_body(),
+            "<tr><td>C</td><td>31</td></tr><tr><td>A</td><td>23</td></tr>"
+            "<tr><td>B</td><td></td></tr><tr><td>D</td><td></td></tr>",
+        )
+
+    def test_table_conditional_get(self):
+        def get_table(request):
+            return TableSort(
+                request,
+                Person.objects.all(),
+                version=lambda table: "v1",
+            )
+
+        @table_condition(get_table)
+        def view(request, table):
+            return HttpResponse(table.render())
+
+        response = view(self.request)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        with self.assertNumQueries(1):
+            response = view(self.request_factory.get("", HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+        response = view(self.request_factory.get("?o=age", HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 200)
+        Person.objects.create(name="Jane Doe", age=31)
+        response = view(self.request_factory.get("", HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+        book = Book.objects.create(title="Book", author=self.person)
+
+        def get_book_table(request):
+            return TableSort(
+                request, Book.objects.all(), last_modified_field="updated_at"
+            )
+
+        @table_condition(get_book_table)
+        def book_view(request, table):
+            return HttpResponse(table.render())
+
+        response = book_view(self.request)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+        table = get_book_table(self.request)
+        self.assertEqual(table.get_last_modified(), book.updated_at)
+        response = book_view(self.request_factory.get("", HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+        book.title = "Changed"
+        book.save()
+        response = book_view(self.request_factory.get("", HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Changed", response.content.decode())
+
+        @table_condition(lambda request: TableSort(request, Person.objects.all()))
+        def person_view(request, table):
+            return HttpResponse(table.render())
+
+        response = person_view(self.request)
+        self.assertNotIn("ETag", response)
+        table = TableSort(self.request, Person.objects.all(), last_modified_field="age")
+        with self.assertRaises(ValueError):
+            table.get_last_modified()
+
+    def test_table_partial_render(self):
+        for name, age in (("Jane Doe", 31), ("Alice", 40)):
+            Person.objects.create(name=name, age=age)
+
+        class PersonTable(Table):
+            class Meta:
+                model = Person
+                fields = ["name", "age"]
+
+        class PersonView(TableSortMixin, TemplateView):
+            table_class = PersonTable
+            template_name = "django_table_sort/table.html"
+
+        view = PersonView.as_view()
+        response = view(self.request_factory.get("?o=-age&table_part=rows&start=1"))
+        self.assertEqual(
+            response.content.decode(),
+            "<tr><td>Jane Doe</td><td>31</td></tr>"
+            "<tr><td>John Doe</td><td>23</td></tr>",
+        )
+        response = view(self.request_factory.get("?o=-age&table_part=body"))
+        self.assertTrue(response.content.decode().startswith("<tbody><tr><td>Alice"))
+        response = view(self.request_factory.get("?o=-age&table_part=headers"))
+        content = response.content.decode()
+        self.assertTrue(content.startswith("<thead>"))
+        self.assertIn('href="?o=age"', content)
+        self.assertNotIn("table_part", content)
+        response = view(self.request_factory.get("?table_part=rows&start=a"))
+        self.assertEqual(response.status_code, 400)
+        response = view(self.request_factory.get("?table_part=footer"))
+        self.assertEqual(response.status_code, 400)
+        response = view(self.request_factory.get(""))
+        self.assertIsInstance(response.context_data["table"], PersonTable)
+        table = TableSort(
+            request=self.request_factory.get("?o=-age"),
+            object_list={"name": ["A", "B", "C"], "age": [1, 3, 2]},
+            apply_ordering=True,
+        )
+        self.assertEqual(table.render_rows(1, 2), "<tr><td>C</td><td>2</td></tr>")
+
+    def test_table_count_strategies(self):
+        for number in range(4):
+            Person.objects.create(name=f"Person {number}", age=number)
+        people = Person.objects.all()
+
+        table = TableSort(self.request, people, count_strategy="exact")
+        self.assertEqual(table.get_total_count(), TableCount(5))
+        self.assertIn('<p class="table-count">5 rows</p>', table.render())
+
+        table = TableSort(self.request, people, count_strategy=CappedCount(limit=3))
+        with self.assertNumQueries(1) as queries:
+            self.assertEqual(str(table.get_total_count()), "3+")
+        self.assertIn("LIMIT 4", queries.captured_queries[0]["sql"])
+        table = TableSort(self.request, people, count_strategy=CappedCount(limit=5))
+        self.assertEqual(table.get_total_count(), TableCount(5))
+
+        with self.assertNumQueries(1):
+            count = CachedCount().count(people.filter(age__lt=3))
+            self.assertEqual(CachedCount().count(people.filter(age__lt=3)), count)
+        self.assertEqual(count, TableCount(3))
+
+        table = TableSort(
+            self.request,
+            people,
+            count_strategy=EstimatedCount(estimate=lambda queryset: 1200),
+        )
+        self.assertEqual(str(table.get_total_count()), "~1,200")
+        table = TableSort(
+            self.request, Person.objects.all()[:2], count_strategy="estimated"
+        )
+        self.assertEqual(table.get_total_count(), TableCount(5))
+
+        table = TableSort(self.request, [self.person], count_strategy="capped")
+        self.assertIn('<p class="table-count">1 row</p>', table.render())
+        self.assertNotIn("table-count", TableSort(self.request, people).render())
+        with self.assertRaises(ValueError):
+            TableSort(self.request, people, count_strategy="fast")
+
+    def test_table_sort_index_threshold(self):
+        publisher = Publisher.objects.create(name="Publisher")
+        Book.objects.create(title="Book", author=self.person, publisher=publisher)
+        request = self.request_factory.get("?o=author&o=title")
+        table = TableSort(
+            request,
+            Book.objects.all(),
+            fields=["title", "author"],
+            apply_ordering=True,
+            sort_index_threshold=0,
+        )
+        self.assertEqual(list(table.get_sortable_columns()), ["author"])
+        self.assertEqual(table.get_ordering(), ["author"])
+        self.assertIn("<th>Title</th>", table.get_table_headers())
+        self.assertNotIn("<th>Author</th>", table.get_table_headers())
+        request = self.request_factory.get("?o=title&o=author")
+        table = TableSort(
+            request, Book.objects.all(), apply_ordering=True, sort_index_threshold=0
+        )
+        self.assertEqual(table.get_ordering(), ["author"])
+        table = TableSort(
+            request, Book.objects.all(), apply_ordering=True, sort_index_threshold=1
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(table.get_ordering(), ["title", "author"])
+
+        class PersonIndexTable(Table):
+            class Meta:
+                model = Person
+                fields = ["name", "age"]
+
+        output = StringIO()
+        call_command("table_sort_indexes", stdout=output)
+        self.assertIn(
+            "PersonIndexTable (tests.Person):\n"
+            "  name: unindexed sort\n"
+            "  age: unindexed sort\n",
+            output.getvalue(),
+        )
+        with self.assertRaises(CommandError):
+            call_command("table_sort_indexes", "--fail", stdout=StringIO())
+
+    def test_table_cell_formatters(self):
+        Person.objects.create(name="<b>Jane</b> & Co", age=31)
+        table = TableSort(
+            self.request,
+            Person.objects.order_by("pk"),
+            added_columns=[
+                (("link", "Link"), lambda person: format_html("<a>{}</a>", person.age))
+            ],
+            column_formatters={"age": lambda age: f"{age} years"},
+        )
+        self.assertEqual(
+            table.get_table_body(),
+            "<tr><td>John Doe</td><td>23 years</td><td><a>23</a></td></tr>"
+            "<tr><td>&lt;b&gt;Jane&lt;/b&gt; &amp; Co</td><td>31 years</td>"
+            "<td><a>31</a></td></tr>",
+        )
+        table = TableSort(
+            self.request,
+            {"name": ["<i>", None]},
+            column_names={"name": "Name"},
+        )
+        self.assertEqual(
+            table.get_table_body(),
+            "<tr><td>&lt;i&gt;</td></tr><tr><td></td></tr>",
+        )
+
+        choices = models.CharField(choices=[("s", "Small"), ("l", "Large")])
+        self.assertEqual(get_field_formatter(choices, nullable=False)("l"), "Large")
+        self.assertEqual(get_field_formatter(Person._meta.get_field("age"), False), str)
+        boolean = get_field_formatter(models.BooleanField(), nullable=True)
+        self.assertEqual(
+            [boolean(True), boolean(False), boolean(None)], ["Yes", "No", ""]
+        )
+        decimal = get_field_formatter(models.DecimalField(decimal_places=2), False)
+        self.assertEqual(decimal(Decimal("1.5")), "1.50")
+        date = get_field_formatter(models.DateField(), nullable=False)
+        self.assertEqual(date(datetime.date(2024, 1, 31)), "Jan. 31, 2024")
+
+    def test_table_lazy_construction(self):
+        with self.assertNumQueries(0):
+            table = TableSort(
+                self.request_factory.get("?o=-age"),
+                Person.objects.all(),
+                apply_ordering=True,
+            )
+        self.assertIsNone(table._column_names)
+        self.assertIsNone(table._sort_state)
+        self.assertIsNone(table.object_list._result_cache)
+        self.assertIn("John Doe", str(table))
+        columns = table.column_names
+        self.assertEqual([column.column_field for column in columns], ["name", "age"])
+        self.assertIs(table.column_names, columns)
+        self.assertGreater(table.columns_time, 0)
+
+        data = {"name": ["A"]}
+        table = TableSort(self.request, data)
+        self.assertIs(table._object_list, data)
+        self.assertIsInstance(table.object_list, ColumnarData)
+
+    def test_table_threaded_columns(self):
+        people = [
+            Person(pk=number, name=f"P{number}", age=number) for number in range(100)
+        ]
+
+        def slow_lookup(person):
+            time.sleep(0.02)
+            return person.age * 2
+
+        table = TableSort(
+            self.request,
+            people,
+            column_names={"name": "Name"},
+            added_columns=[(("double", "Double"), slow_lookup)],
+            threaded_columns=["double"],
+            max_workers=25,
+        )
+        start = time.perf_counter()
+        body = table.get_table_body()
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(
+            body,
+            "".join(
+                f"<tr><td>P{number}</td><td>{number * 2}</td></tr>"
+                for number in range(100)
+            ),
+        )
+
+        def stuck_lookup(person):
+            time.sleep(0.5 if person.age == 1 else 0)
+            return person.age
+
+        table = TableSort(
+            self.request,
+            people[:3],
+            column_names={"name": "Name"},
+            added_columns=[(("age", "Age"), stuck_lookup)],
+            threaded_columns=["age"],
+            threaded_timeout=0.1,
+            threaded_fallback="-",
+        )
+        self.assertEqual(
+            table.get_table_body(),
+            "<tr><td>P0</td><td>0</td></tr>"
+            "<tr><td>P1</td><td>-</td></tr>"
+            "<tr><td>P2</td><td>2</td></tr>",
+        )
+        time.sleep(0.1)
+        self.assertEqual(
+            list(table.iter_export_rows()),
+            [["P0", 0], ["P1", "-"], ["P2", 2]],
+        )
+
+        release = threading.Event()
+
+        def hanging_lookup(person):
+            release.wait(5)
+            return person.age
+
+        table = TableSort(
+            self.request,
+            people[:5],
+            column_names={"name": "Name"},
+            added_columns=[(("age", "Age"), hanging_lookup)],
+            threaded_columns=["age"],
+            threaded_timeout=0.01,
+            max_workers=3,
+        )
+        threads = threading.active_count()
+        try:
+            for _ in range(5):
+                self.assertNotIn("<td>0</td>", table.get_table_body())
+            self.assertLessEqual(threading.active_count() - threads, 3)
+        finally:
+            release.set()
+
+        table = TableSort(
+            self.request,
+            people,
+            column_names={"name": "Name"},
+            added_columns=[(("double", "Double"), slow_lookup)],
+            threaded_columns=["double"],
+            max_workers=25,
+            instrument=True,
+        )
+        table.render()
+        self.assertGreaterEqual(table.metrics.column_times["double"], 0.02)
+        self.assertLess(table.metrics.column_times["double"], 1)
+
+    def test_table_memoized_columns(self):
+        people = [
+            Person(pk=number, name=f"P{number}", age=number % 3) for number in range(9)
+        ]
+        calls = []
+
+        def age_label(person):
+            calls.append(person.age)
+            return f"Age {person.age}"
+
+        label = memoize(age_label, key=attrgetter("age"))
+        table = TableSort(
+            self.request,
+            people,
+            column_names={"name": "Name"},
+            added_columns=[(("label", "Label"), label)],
+        )
+        self.assertIn("<td>P4</td><td>Age 1</td>", table.get_table_body())
+        table.get_table_body()
+        self.assertEqual(calls, [0, 1, 2, 0, 1, 2])
+        self.assertEqual((label.stats.hits, label.stats.misses), (12, 6))
+
+        calls.clear()
+        label = memoize(age_label, key=attrgetter("age"), scope="process", maxsize=3)
+        for _ in range(2):
+            TableSort(
+                self.request,
+                people[:6],
+                column_names={"name": "Name"},
+                added_columns=[(("label", "Label"), label)],
+            ).get_table_body()
+        self.assertEqual(calls, [0, 1, 2])
+        self.assertEqual(label.stats.hits, 9)
+        label.cache.maxsize = 2
+        label.get_accessor()(Person(age=3))
+        self.assertEqual(len(label.cache), 2)
+        label = memoize(age_label, key=attrgetter("age"), scope="process", timeout=0)
+        accessor = label.get_accessor()
+        accessor(people[0])
+        accessor(people[0])
+        self.assertEqual(label.stats.misses, 2)
+        with self.assertRaises(ValueError):
+            memoize(age_label, key=attrgetter("age"), scope="request")
+
+    def test_table_renderers(self):
+        Person.objects.create(name="Jane & Co", age=31)
+        request = self.request_factory.get("?o=-age")
+        string_table = TableSort(request, Person.objects.order_by("pk"))
+        template_table = TableSort(
+            request, Person.objects.order_by("pk"), renderer=TemplateRenderer()
+        )
+        self.assertEqual(template_table.get_table_body(), string_table.get_table_body())
+        headers = template_table.get_table_headers()
+        self.assertIn('<a href="?o=age" role="button" title="Toggle sort">', headers)
+        self.assertIn('<i class="fa-solid fa-sort-down"></i>', headers)
+        self.assertIn('title="Sort by Full Name"', headers)
+
+        for renderer in (StringRenderer, TemplateRenderer):
+            table = TableSort(
+                request,
+                Person.objects.order_by("pk"),
+                renderer=renderer(cell_templates={"age": "<b>{{ value }}</b>"}),
+                added_columns=[(("first", "First"), lambda person: person.name[0])],
+            )
+            self.assertEqual(
+                table.get_table_body(),
+                "<tr><td>John Doe</td><td><b>23</b></td><td>J</td></tr>"
+                "<tr><td>Jane &amp; Co</td><td><b>31</b></td><td>J</td></tr>",
+            )
+            self.assertIn("<th>First</th>", table.get_table_headers())
+            table = TableSort(
+                request,
+                Person.objects.all(),
+                renderer=renderer(),
+                column_names={"name": "<Name>", "age": format_html("<b>Age</b>")},
+                added_columns=[(("first", "<First>"), lambda person: "")],
+            )
+            headers = table.get_table_headers()
+            self.assertIn("&lt;Name&gt;", headers)
+            self.assertIn('title="Sort by &lt;Name&gt;"', headers)
+            self.assertIn("<b>Age</b>", headers)
+            self.assertIn("<th>&lt;First&gt;</th>", headers)